@@ -0,0 +1,419 @@
+# benchmarks/bench_tesseract.py
+
+# Reproduzierbare Benchmarks für DBManager, den JanEyeReportViewer und die Netzwerk-Topologie.
+#
+# Verwendung:
+#   python benchmarks/bench_tesseract.py --scale 10k --output bench_10k.json
+#   python benchmarks/bench_tesseract.py --scale 1m --viewer-backend mock
+#   python benchmarks/bench_tesseract.py --compare bench_alt.json bench_neu.json
+#
+# Der Viewer läuft mit echtem Tk, wenn ein Display vorhanden ist (z.B. unter
+# "xvfb-run python benchmarks/bench_tesseract.py"), sonst mit einer Treeview-Attrappe.
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import resource
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import sqlalchemy
+from sqlalchemy import func
+
+import db_mgr
+from db_mgr import DBManager, Scan, CodeAnalysisReport, WordlistEntry, ExploitEntry
+from benchmarks import datagen
+
+# Die Plugins importieren das DB-Modul unter seinem Release-Namen
+sys.modules.setdefault("db_manager_updated", db_mgr)
+
+RESULT_FORMAT_VERSION = 1
+BULK_CHUNK_SIZE = 10_000
+ADD_ENTRY_SAMPLE = 1_000
+
+
+class _MockTreeview:
+    """
+    Minimaler Ersatz für ttk.Treeview, damit refresh_reports ohne Display gemessen werden kann.
+    Bildet nur die von JanEyeReportViewer genutzten Methoden nach.
+    """
+    def __init__(self):
+        self._items = {}
+        self._next_id = 0
+
+    def get_children(self, item=""):
+        return tuple(self._items)
+
+    def delete(self, *items):
+        for item in items:
+            del self._items[item]
+
+    def insert(self, parent, index, iid=None, values=()):
+        self._next_id += 1
+        iid = iid or f"I{self._next_id:X}"
+        # Treeview speichert Werte als Tcl-Strings
+        self._items[iid] = tuple("" if v is None else str(v) for v in values)
+        return iid
+
+    def item(self, iid, option=None):
+        return self._items[iid] if option == "values" else {"values": self._items[iid]}
+
+
+def _measure(name, func, rows=None, repeat=1, trace_memory=True):
+    """
+    Führt func repeat-mal zeitgemessen aus und einmal zusätzlich mit tracemalloc.
+
+    Returns:
+        Dict mit Laufzeit-Statistik, Durchsatz und Spitzen-Speicher.
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    entry = {
+        "name": name,
+        "repeat": repeat,
+        "seconds_min": min(timings),
+        "seconds_median": statistics.median(timings),
+    }
+    if rows is None and isinstance(result, int):
+        rows = result
+    if rows is not None:
+        entry["rows"] = rows
+        entry["rows_per_second"] = rows / entry["seconds_min"] if entry["seconds_min"] > 0 else None
+    if trace_memory:
+        tracemalloc.start()
+        func()
+        entry["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    print(f"  {name:<40} {entry['seconds_min'] * 1000:10.2f} ms", file=sys.stderr)
+    return entry
+
+
+def _bulk_load(manager, table, rows):
+    """Lädt generierte Zeilen in Chunks per Core-Insert und gibt die Anzahl zurück."""
+    count = 0
+    with manager.engine.begin() as conn:
+        for chunk in datagen.chunked(rows, BULK_CHUNK_SIZE):
+            conn.execute(table.insert(), chunk)
+            count += len(chunk)
+    return count
+
+
+def bench_inserts(manager, sizes, seed):
+    """Misst den Durchsatz von add_entry (Stichprobe) und Bulk-Inserts (gesamter Datensatz)."""
+    results = []
+    # add_entry öffnet pro Eintrag eine eigene Session; deshalb nur eine Stichprobe
+    sample_path = os.path.join(os.path.dirname(manager.db_path), "add_entry.db")
+    # Bei --workdir liegt die Datei vom letzten Lauf noch da; immer mit leerer Tabelle messen
+    if os.path.exists(sample_path):
+        os.remove(sample_path)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        sample_manager = DBManager(sample_path)
+    sample = [CodeAnalysisReport(**row) for row in datagen.generate_reports(ADD_ENTRY_SAMPLE, 1, seed)]
+    for report in sample:
+        report.id = None
+
+    def add_sample():
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for report in sample:
+                sample_manager.add_entry(report)
+        return len(sample)
+    results.append(_measure("insert.add_entry", add_sample, trace_memory=False))
+
+    loads = [
+        ("insert.bulk.scans", Scan.__table__, lambda: datagen.generate_scans(sizes["scans"], seed)),
+        ("insert.bulk.reports", CodeAnalysisReport.__table__,
+         lambda: datagen.generate_reports(sizes["reports"], sizes["scans"], seed + 1)),
+        ("insert.bulk.wordlist", WordlistEntry.__table__, lambda: datagen.generate_wordlist(sizes["wordlist"], seed + 2)),
+        ("insert.bulk.exploits", ExploitEntry.__table__, lambda: datagen.generate_exploits(sizes["exploits"], seed + 3)),
+    ]
+    for name, table, rows in loads:
+        results.append(_measure(name, lambda: _bulk_load(manager, table, rows()), trace_memory=False))
+    return results
+
+
+def bench_queries(manager, cached_manager, sizes, repeat, full_scans):
+    """
+    Misst die Latenz typischer gefilterter Abfragen und der get_all_*-Methoden.
+    manager läuft ohne Query-Cache (echte SQL-Latenz); die Treffer-Latenz des Caches
+    wird mit cached_manager getrennt als "*.cached" gemessen.
+    """
+    def session_query(build):
+        def run():
+            session = manager.Session()
+            try:
+                return len(build(session).all())
+            finally:
+                session.close()
+        return run
+
+    middle_scan = max(1, sizes["scans"] // 2)
+    queries = [
+        ("query.reports.severity_critical",
+         lambda s: s.query(CodeAnalysisReport).filter_by(severity="Critical").limit(1000)),
+        ("query.reports.new_and_high",
+         lambda s: s.query(CodeAnalysisReport).filter_by(status="New", severity="High").limit(1000)),
+        ("query.reports.by_scan",
+         lambda s: s.query(CodeAnalysisReport).filter_by(scan_id=middle_scan)),
+        ("query.reports.count_by_severity",
+         lambda s: s.query(CodeAnalysisReport.severity, func.count()).group_by(CodeAnalysisReport.severity)),
+        ("query.scans.by_type",
+         lambda s: s.query(Scan).filter_by(scan_type="network").limit(1000)),
+        ("query.wordlist.lookup",
+         lambda s: s.query(WordlistEntry).filter(WordlistEntry.word.like(f"w{sizes['wordlist'] // 2:x}\\_%", escape="\\"))),
+        ("query.exploits.by_cve",
+         lambda s: s.query(ExploitEntry).filter(ExploitEntry.cve_id == "CVE-2020-31337")),
+    ]
+    results = [_measure(name, session_query(build), repeat=repeat) for name, build in queries]
+    dbmanager_queries = [
+        ("query.dbmanager.count_reports_by_severity", lambda m: len(m.count_reports_by_severity())),
+        ("query.dbmanager.summaries_page",
+         lambda m: len(m.get_code_analysis_report_summaries(limit=500, severity="High"))),
+    ]
+    for name, run in dbmanager_queries:
+        results.append(_measure(name, lambda: run(manager), repeat=repeat))
+    cached_manager.clear_cache()
+    for name, run in dbmanager_queries:
+        run(cached_manager) # Cache füllen; gemessen werden nur Treffer
+        results.append(_measure(f"{name}.cached", lambda: run(cached_manager), repeat=repeat))
+    if full_scans:
+        results.append(_measure("query.get_all_scans", lambda: len(manager.get_all_scans())))
+        results.append(_measure("query.get_all_code_analysis_reports",
+                                lambda: len(manager.get_all_code_analysis_reports())))
+    return results
+
+
+def _make_viewer(manager, backend):
+    """Erstellt einen JanEyeReportViewer mit echtem Tk oder Treeview-Attrappe."""
+    from plugins.jan_eye_report_viewer import JanEyeReportViewer
+
+    viewer = JanEyeReportViewer(db_manager=manager)
+    if backend == "auto":
+        backend = "tk" if os.environ.get("DISPLAY") else "mock"
+    if backend == "tk":
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        viewer.create_gui(root)
+        return viewer, backend, root
+    viewer.reports_tree = _MockTreeview()
+    return viewer, backend, None
+
+
+def bench_viewer(manager, backend, repeat):
+    """Misst refresh_reports des JanEyeReportViewer (inklusive Leeren der bestehenden Einträge)."""
+    viewer, backend, root = _make_viewer(manager, backend)
+
+    def refresh():
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            viewer.refresh_reports()
+        if root is not None:
+            root.update_idletasks()
+        return len(viewer.reports_tree.get_children())
+    try:
+        entry = _measure(f"viewer.refresh_reports.{backend}", refresh, repeat=repeat)
+    finally:
+        if root is not None:
+            root.destroy()
+    return [entry]
+
+
+def bench_report_table(manager, repeat):
+    """Misst Aufbau, Filter, mehrstufige Sortierung und Gruppierung des ReportTable-Modells."""
+    from plugins.report_table import ReportTable
+
+    summaries = manager.get_code_analysis_report_summaries()
+    results = [_measure("table.build", lambda: len(ReportTable.from_summaries(summaries)))]
+    table = ReportTable.from_summaries(summaries)
+    everything = range(len(table))
+    results += [
+        _measure("table.filter.severity_status",
+                 lambda: len(table.filter(severity={"Critical", "High"}, status="New")), repeat=repeat),
+        _measure("table.filter.text", lambda: len(table.filter(text="krypto")), repeat=repeat),
+        _measure("table.sort.severity_date",
+                 lambda: len(table.sort(everything, [("severity", False), ("analysis_date", True)])), repeat=repeat),
+        _measure("table.sort.file_path_line",
+                 lambda: len(table.sort(everything, [("file_path", False), ("line_number", False)])), repeat=repeat),
+        _measure("table.group_counts.severity", lambda: len(table.group_counts("severity")), repeat=repeat),
+    ]
+    return results
+
+
+def bench_snapshot(manager, sizes, workdir, viewer_backend, repeat):
+    """Misst Schreiben und Öffnen eines Report-Snapshots sowie refresh_reports aus dem Snapshot."""
+    from report_snapshot import ReportSnapshot
+
+    path = os.path.join(workdir, "bench_scan.tsnap")
+    scan_id = max(1, sizes["scans"] // 2)
+    results = [_measure("snapshot.write_scan", lambda: manager.write_report_snapshot(scan_id, path),
+                        trace_memory=False)]
+
+    def open_and_read():
+        with ReportSnapshot(path) as snapshot:
+            return len(snapshot.row(len(snapshot) // 2)) if len(snapshot) else 0
+    results.append(_measure("snapshot.open_random_row", open_and_read, repeat=repeat))
+
+    if viewer_backend != "none":
+        viewer, backend, root = _make_viewer(manager, viewer_backend)
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                viewer.open_snapshot(path)
+
+            def refresh():
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    viewer.refresh_reports()
+                return len(viewer.reports_tree.get_children())
+            results.append(_measure(f"viewer.refresh_reports.snapshot.{backend}", refresh, repeat=repeat))
+        finally:
+            viewer.close_snapshot(refresh=False)
+            if root is not None:
+                root.destroy()
+    return results
+
+
+def bench_topology(manager, repeat):
+    """Misst Aggregation der Scan-Ziele, Aufbau des Topologie-Modells und Viewport-Abfragen."""
+    from plugins.topology_model import TopologyModel, LEVEL_HOST, LEVEL_SUBNET
+
+    results = [_measure("topology.get_scan_targets", lambda: len(manager.get_scan_targets()),
+                        trace_memory=False)]
+    rows = manager.get_scan_targets()
+
+    def build():
+        return len(TopologyModel().update(rows))
+    results.append(_measure("topology.model.build", build))
+    model = TopologyModel()
+    model.update(rows)
+    x0, y0, x1, y1 = model.bounds()
+    results += [
+        _measure("topology.model.update_unchanged", lambda: len(model.update(rows)), repeat=repeat),
+        _measure("topology.visible.subnets_all", lambda: len(model.visible(LEVEL_SUBNET, x0, y0, x1, y1)),
+                 repeat=repeat),
+        # Ausschnitt von etwa 100x70 Zielen (1000x700 Pixel bei 10 Pixel pro Ziel)
+        _measure("topology.visible.hosts_viewport", lambda: len(model.visible(LEVEL_HOST, 0, 0, 100, 70)),
+                 repeat=repeat),
+        _measure("topology.hit_test", lambda: sum(model.hit_test(LEVEL_HOST, x + 0.5, 0.5) is not None
+                                                  for x in range(1000)), repeat=repeat, trace_memory=False),
+    ]
+    return results
+
+
+def run_benchmarks(scale, workdir, seed=0, repeat=5, viewer_backend="auto", full_scans=None):
+    """
+    Führt alle Benchmarks für eine Skalierungsstufe aus.
+
+    Returns:
+        Ergebnis-Dict (JSON-serialisierbar).
+    """
+    sizes = datagen.scale_sizes(scale)
+    if full_scans is None:
+        # Vollständige Tabellen-Ladevorgänge sind ab 10M Zeilen nicht mehr sinnvoll
+        full_scans = sizes["reports"] <= datagen.SCALES["1m"]
+    db_path = os.path.join(workdir, f"bench_{scale}.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        # Messungen ohne Query-Cache, damit Wiederholungen SQL statt Cache-Treffer messen
+        manager = DBManager(db_path, cache_size=0)
+        cached_manager = DBManager(db_path)
+
+    print(f"Benchmark '{scale}': {sizes}", file=sys.stderr)
+    results = []
+    results += bench_inserts(manager, sizes, seed)
+    results += bench_queries(manager, cached_manager, sizes, repeat, full_scans)
+    if viewer_backend != "none" and full_scans:
+        results += bench_viewer(manager, viewer_backend, max(1, repeat // 2))
+        results += bench_report_table(manager, repeat)
+    if full_scans:
+        results += bench_topology(manager, repeat)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results += bench_snapshot(manager, sizes, workdir, viewer_backend, repeat)
+
+    return {
+        "format_version": RESULT_FORMAT_VERSION,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "scale": scale,
+        "sizes": sizes,
+        "seed": seed,
+        "environment": {
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "db_size_bytes": os.path.getsize(db_path),
+        # ru_maxrss ist unter Linux in KiB angegeben
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "query_cache": cached_manager.cache_stats(),
+        "results": results,
+    }
+
+
+def compare_results(old_path, new_path, threshold=0.10):
+    """
+    Vergleicht zwei Ergebnisdateien und markiert Verschlechterungen über threshold.
+
+    Returns:
+        Anzahl der gefundenen Regressionen.
+    """
+    with open(old_path) as f:
+        old = {r["name"]: r for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = {r["name"]: r for r in json.load(f)["results"]}
+
+    regressions = 0
+    for name in sorted(set(old) & set(new)):
+        ratio = new[name]["seconds_min"] / old[name]["seconds_min"] if old[name]["seconds_min"] else 1.0
+        marker = ""
+        if ratio > 1 + threshold:
+            marker = "  <-- REGRESSION"
+            regressions += 1
+        print(f"{name:<40} {old[name]['seconds_min'] * 1000:10.2f} ms -> "
+              f"{new[name]['seconds_min'] * 1000:10.2f} ms  x{ratio:5.2f}{marker}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tesseract DBManager/Viewer Benchmarks")
+    parser.add_argument("--scale", choices=sorted(datagen.SCALES), default="10k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="Wiederholungen pro Abfrage")
+    parser.add_argument("--viewer-backend", choices=["auto", "tk", "mock", "none"], default="auto")
+    parser.add_argument("--workdir", help="Verzeichnis für die Benchmark-Datenbanken (Standard: temporär)")
+    parser.add_argument("--output", help="JSON-Ergebnisdatei (Standard: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Zwei Ergebnisdateien vergleichen")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return 1 if compare_results(*args.compare) else 0
+
+    with contextlib.ExitStack() as stack:
+        workdir = args.workdir or stack.enter_context(tempfile.TemporaryDirectory(prefix="tesseract_bench_"))
+        result = run_benchmarks(args.scale, workdir, seed=args.seed, repeat=args.repeat,
+                                viewer_backend=args.viewer_backend)
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+# benchmarks/datagen.py
+
+# Synthetische, reproduzierbare Testdaten für die Tesseract-Benchmarks.
+# Alle Generatoren liefern Dicts (Spaltenname -> Wert), die direkt als
+# Parameter für Table.insert() verwendet werden können.
+
+import datetime
+import random
+
+# Skalierungsstufen: Anzahl der CodeAnalysisReports pro Stufe
+SCALES = {
+    "10k": 10_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+SCAN_TYPES = ["network", "host", "wifi", "bluetooth", "initial_code_scan"]
+SCAN_STATUSES = ["completed", "running", "failed"]
+ISSUE_TYPES = ["Vulnerability", "BadPractice", "InformationLeak", "Informational"]
+SEVERITIES = ["Critical", "High", "Medium", "Low", "Informational"]
+REPORT_STATUSES = ["New", "Triaged", "FalsePositive", "Fixed", "Ignored"]
+WORD_CATEGORIES = ["common_passwords", "usernames", "technical_terms"]
+WORD_SOURCES = ["SET_dictionaries", "OSINT_crawl", "custom"]
+EXPLOIT_TYPES = ["remote", "local", "web_app"]
+PLATFORMS = ["Windows", "Linux", "Web"]
+LANGUAGES = ["Python", "Ruby", "C"]
+
+_MODULES = ["core", "plugins", "utils", "krypto", "net", "ai"]
+_SNIPPETS = [
+    'api_key = "sk_hardcoded_secret_123"',
+    'os.system("nmap -sV " + target_ip)',
+    'hashed_pass = hashlib.md5(password.encode()).hexdigest()',
+    'logger.info(f"Connection from {client_ip}")',
+    'cursor.execute("SELECT * FROM users WHERE name = \'%s\'" % name)',
+]
+_BASE_DATE = datetime.datetime(2024, 1, 1)
+
+
+def scale_sizes(scale):
+    """
+    Gibt die Zeilenanzahl je Tabelle für eine Skalierungsstufe zurück.
+    Verhältnis: 10 Berichte pro Scan, 1 Exploit pro 100 Berichte.
+    """
+    reports = SCALES[scale]
+    return {
+        "scans": max(1, reports // 10),
+        "reports": reports,
+        "wordlist": reports,
+        "exploits": max(1, reports // 100),
+    }
+
+
+def generate_scans(count, seed=0):
+    """Erzeugt count Scan-Zeilen mit fortlaufenden IDs ab 1."""
+    rng = random.Random(seed)
+    for scan_id in range(1, count + 1):
+        start_time = _BASE_DATE + datetime.timedelta(minutes=scan_id * 7)
+        yield {
+            "id": scan_id,
+            "scan_type": rng.choice(SCAN_TYPES),
+            "target": f"10.{(scan_id >> 16) & 255}.{(scan_id >> 8) & 255}.{scan_id & 255}",
+            "start_time": start_time,
+            "end_time": start_time + datetime.timedelta(seconds=rng.randint(5, 3600)),
+            "status": rng.choice(SCAN_STATUSES),
+            "results": '{"files_scanned": %d, "total_issues": %d}' % (rng.randint(1, 500), rng.randint(0, 50)),
+        }
+
+
+def generate_reports(count, scan_count, seed=1):
+    """Erzeugt count CodeAnalysisReport-Zeilen, gleichmäßig auf scan_count Scans verteilt."""
+    rng = random.Random(seed)
+    for report_id in range(1, count + 1):
+        snippet = rng.choice(_SNIPPETS)
+        yield {
+            "id": report_id,
+            "scan_id": (report_id - 1) % scan_count + 1,
+            "file_path": f"/tesseract/{rng.choice(_MODULES)}/module_{rng.randint(0, 4999)}.py",
+            "issue_type": rng.choice(ISSUE_TYPES),
+            "severity": rng.choice(SEVERITIES),
+            "description": f"Synthetic finding {report_id}: " + " ".join(rng.choices(_SNIPPETS, k=3)),
+            "line_number": rng.randint(1, 2000) if rng.random() > 0.1 else None,
+            "code_snippet": snippet,
+            "analysis_date": _BASE_DATE + datetime.timedelta(seconds=report_id * 13),
+            "status": rng.choice(REPORT_STATUSES),
+        }
+
+
+def generate_wordlist(count, seed=2):
+    """Erzeugt count WordlistEntry-Zeilen mit eindeutigen Wörtern."""
+    rng = random.Random(seed)
+    for word_id in range(1, count + 1):
+        yield {
+            "id": word_id,
+            "word": f"w{word_id:x}_{rng.randint(0, 99999)}",
+            "category": rng.choice(WORD_CATEGORIES),
+            "source": rng.choice(WORD_SOURCES),
+            "added_date": _BASE_DATE + datetime.timedelta(seconds=word_id),
+        }
+
+
+def generate_exploits(count, seed=3):
+    """Erzeugt count ExploitEntry-Zeilen mit eindeutigen Namen."""
+    rng = random.Random(seed)
+    for exploit_id in range(1, count + 1):
+        yield {
+            "id": exploit_id,
+            "name": f"exploit_{exploit_id}",
+            "description": "Synthetic exploit " + rng.choice(_SNIPPETS),
+            "cve_id": f"CVE-{rng.randint(1999, 2025)}-{rng.randint(1000, 99999)}",
+            "exploit_type": rng.choice(EXPLOIT_TYPES),
+            "platform": rng.choice(PLATFORMS),
+            "language": rng.choice(LANGUAGES),
+            "path": f"/tesseract/exploits/{exploit_id}.py",
+            "added_date": _BASE_DATE + datetime.timedelta(hours=exploit_id),
+        }
+
+
+def chunked(rows, size):
+    """Teilt einen Zeilen-Generator in Listen der Länge size auf."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
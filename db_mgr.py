@@ -1,14 +1,30 @@
 # db_manager_updated.py
 
 import datetime
+import glob
+import os
+import re
+import sqlite3
+import threading
 from sqlalchemy import create_engine, Column, Integer, String, DateTime, ForeignKey, Text, Boolean
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, relationship, make_transient_to_detached
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import inspect
+from sqlalchemy import inspect, event, func, case
+from sqlalchemy.exc import SQLAlchemyError
+
+from instrumentation import get_instrumentation, instrumented, last_sql_event, set_fetched_rows
+from query_cache import QueryCache
+from report_snapshot import write_snapshot
 
 # Basis für die deklarative Definition von Tabellen
 Base = declarative_base()
 
+# Maximale Länge der in SQL gekürzten Text-Vorschauen für Listenansichten
+PREVIEW_LENGTH = 80
+
+# Format der Archiv-Monate ('YYYY-MM'); Teil von Dateinamen und ATTACH-Schema-Namen
+_MONTH_PATTERN = re.compile(r"^\d{4}-\d{2}$")
+
 class Scan(Base):
     """
     Repräsentiert einen Scan-Eintrag in der Datenbank.
@@ -85,13 +101,86 @@ class CodeAnalysisReport(Base):
         return f"<CodeAnalysisReport(id={self.id}, file='{self.file_path}', issue='{self.issue_type}', severity='{self.severity}')>"
 
 
+class RetentionPolicy:
+    """
+    Beschreibt, welche Scans (samt ihrer CodeAnalysisReports) aus der
+    aktiven Datenbank entfernt werden.
+    Scans, die älter als max_age_days sind und auf scan_type/status passen,
+    werden in Monats-Archive verschoben (archive=True) oder nur gelöscht.
+    Maßgeblich ist start_time, ersatzweise end_time; Scans ganz ohne Zeitstempel
+    werden von keiner Policy erfasst und bleiben in der aktiven Datenbank.
+    """
+    def __init__(self, max_age_days, scan_type=None, status=None, archive=True):
+        self.max_age_days = max_age_days
+        self.scan_type = scan_type  # None = alle Scan-Typen
+        self.status = status        # None = alle Status
+        self.archive = archive
+
+    def cutoff(self, now=None):
+        """Gibt den Zeitpunkt zurück, vor dem ein Scan als 'kalt' gilt."""
+        now = now or datetime.datetime.now()
+        return now - datetime.timedelta(days=self.max_age_days)
+
+    def __repr__(self):
+        return (f"<RetentionPolicy(max_age_days={self.max_age_days}, scan_type='{self.scan_type}', "
+                f"status='{self.status}', archive={self.archive})>")
+
+
+def _check_month(month):
+    """Prüft einen Archiv-Monat ('YYYY-MM'), bevor er in Pfade oder SQL eingesetzt wird."""
+    if not isinstance(month, str) or not _MONTH_PATTERN.match(month):
+        raise ValueError(f"Ungültiger Archiv-Monat {month!r}, erwartet 'YYYY-MM'.")
+    return month
+
+
+def _preview(column, length):
+    """
+    SQL-Ausdruck für eine einzeilige Vorschau einer Textspalte:
+    Zeilenumbrüche werden ersetzt, überlange Texte mit '...' gekürzt.
+    """
+    flattened = func.replace(func.substr(column, 1, length), "\n", " ", type_=String)
+    return case((func.length(column) > length, flattened + "..."), else_=flattened)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Wird bei jeder neuen SQLite-Verbindung ausgeführt.
+    auto_vacuum=INCREMENTAL wirkt nur bei neuen Datenbanken (oder nach VACUUM),
+    ist aber Voraussetzung dafür, dass incremental_vacuum Speicher freigibt.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cursor.close()
+
+
 class DBManager:
     """
     Verwaltet die Datenbankverbindung und CRUD-Operationen für Tesseract.
     """
-    def __init__(self, db_path='teasesraect.db'):
-        self.engine = create_engine(f'sqlite:///{db_path}')
+    def __init__(self, db_path='teasesraect.db', archive_dir=None, instrumentation=None, cache_size=256):
+        self.db_path = db_path
+        # Monats-Archive liegen standardmäßig neben der aktiven Datenbank
+        self.archive_dir = archive_dir or os.path.join(os.path.dirname(os.path.abspath(db_path)), 'archive')
+        # uri=True, damit attach_archives Archive per 'file:...?mode=ro' schreibgeschützt anhängen kann;
+        # ein normaler Pfad ohne 'file:'-Präfix wird weiterhin als Dateiname behandelt
+        self.engine = create_engine(f'sqlite:///{db_path}', connect_args={"uri": True})
+        event.listen(self.engine, "connect", _set_sqlite_pragmas)
+        # Laufzeit-Messungen aller Statements (Standard: prozessweiter Ringpuffer)
+        self.instrumentation = instrumentation or get_instrumentation()
+        self.instrumentation.attach_engine(self.engine)
+        # Ergebnis-Cache für Lesezugriffe; jeder Schreibzugriff invalidiert die betroffene Tabelle
+        self.query_cache = QueryCache(cache_size)
+        event.listen(self.engine, "after_cursor_execute", self._invalidate_on_write)
+        event.listen(self.engine, "commit", self._invalidate_on_commit)
+        event.listen(self.engine, "checkin", self._absorb_own_commit)
+        # Eigene Verbindung, die nur Commits anderer Verbindungen erkennt (zweiter DBManager,
+        # tesseract_cli in einem anderen Prozess); PRAGMA data_version ändert sich dann
+        self._watch_connection = sqlite3.connect(db_path, check_same_thread=False) if cache_size else None
+        self._watch_lock = threading.Lock()
+        self._data_version = None
         self.Session = sessionmaker(bind=self.engine)
+        # Engines der per open_archive geöffneten Archive (Monat -> Engine), siehe close_archives
+        self._archive_engines = {}
         self._create_tables_if_not_exists()
 
     def _create_tables_if_not_exists(self):
@@ -109,6 +198,116 @@ class DBManager:
             else:
                 print(f"INFO: Tabelle '{table_name}' existiert bereits.")
 
+    # --- Query-Cache ---
+
+    def _invalidate_on_write(self, conn, cursor, statement, parameters, context, executemany):
+        """
+        Engine-Hook: verwirft gecachte Ergebnisse der Tabelle, in die gerade geschrieben wurde.
+        Gilt für ORM-Flushes ebenso wie für Core- und Bulk-Statements.
+        """
+        if not statement.lstrip()[:7].upper().startswith(("INSERT", "UPDATE", "DELETE", "REPLACE")):
+            return
+        compiled = getattr(context, "compiled", None)
+        table = getattr(compiled.statement, "table", None) if compiled is not None else None
+        # Rohes SQL ohne bekannte Zieltabelle: vorsichtshalber alles invalidieren
+        tables = {table.name} if table is not None else set(Base.metadata.tables)
+        conn.info.setdefault("_tesseract_written_tables", set()).update(tables)
+        self.query_cache.invalidate(*tables)
+
+    def _invalidate_on_commit(self, conn):
+        """
+        Engine-Hook (läuft unmittelbar vor dem eigentlichen Commit): invalidiert erneut,
+        damit zwischenzeitlich gecachte Ergebnisse nicht veraltet bleiben, und merkt sich
+        den eigenen Schreib-Commit, damit _check_data_version ihn nicht für fremd hält.
+        """
+        tables = conn.info.pop("_tesseract_written_tables", None)
+        if tables:
+            self.query_cache.invalidate(*tables)
+            if self._watch_connection is not None:
+                # Fremde Commits bis hierher noch erkennen, bevor der eigene sie überdeckt
+                self._check_data_version()
+                conn.info["_tesseract_own_commit"] = True
+
+    def _absorb_own_commit(self, dbapi_connection, connection_record):
+        """
+        Pool-Hook (Rückgabe der Verbindung nach dem Commit): übernimmt die durch den
+        eigenen Commit geänderte data_version, ohne den Cache zu leeren – die betroffenen
+        Tabellen hat _invalidate_on_commit bereits gezielt invalidiert.
+        """
+        if connection_record.info.pop("_tesseract_own_commit", False):
+            with self._watch_lock:
+                self._data_version = self._read_data_version()
+
+    def _read_data_version(self):
+        return self._watch_connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def _check_data_version(self):
+        """
+        Leert den Cache, wenn seit der letzten Prüfung eine fremde Verbindung
+        (zweiter DBManager, tesseract_cli in einem anderen Prozess) in die Datenbankdatei
+        geschrieben hat. Die eigenen Commits übernimmt _absorb_own_commit; ein fremder
+        Commit im kurzen Fenster zwischen eigenem Commit und Rückgabe der Verbindung
+        bleibt dabei unerkannt.
+        """
+        if self._watch_connection is None:
+            return
+        with self._watch_lock:
+            version = self._read_data_version()
+            if version != self._data_version:
+                if self._data_version is not None:
+                    self.query_cache.clear()
+                self._data_version = version
+
+    def _cached_all(self, query, *tables):
+        """
+        Führt query.all() aus oder liefert ein gecachtes Ergebnis.
+        Schlüssel ist das normalisierte SQL samt Parametern; tables sind die
+        gelesenen Tabellen, über die das Ergebnis später invalidiert wird.
+        Gecacht werden nur unveränderliche Row-Tupel. Bei Abfragen auf genau ein
+        Modell (z.B. session.query(Scan)) werden dessen Spalten gecacht und bei jedem
+        Aufruf neue, losgelöste (detached) Objekte daraus gebaut, damit Änderungen eines
+        Aufrufers nicht bei den anderen ankommen.
+        """
+        entities = [description["entity"] for description in query.column_descriptions
+                    if description["entity"] is not None and description["expr"] is description["entity"]]
+        if len(entities) == 1 and len(query.column_descriptions) == 1:
+            model = entities[0]
+            keys = [attr.key for attr in inspect(model).column_attrs]
+            rows = self._cached_rows(query.with_entities(*(getattr(model, key) for key in keys)), tables)
+            return [self._detached_entity(model, keys, row) for row in rows]
+        if entities:
+            # Gemischte Abfragen (Modell plus Spalten) werden nicht gecacht
+            return query.all()
+        return self._cached_rows(query, tables)
+
+    def _cached_rows(self, query, tables):
+        self._check_data_version()
+        compiled = query.statement.compile(self.engine)
+        key = QueryCache.make_key(compiled, compiled.params)
+        hit, result = self.query_cache.get(key)
+        if not hit:
+            last_sql_event()
+            result = query.all()
+            set_fetched_rows(last_sql_event(), len(result))
+            self.query_cache.put(key, result, tables)
+        return list(result)
+
+    @staticmethod
+    def _detached_entity(model, keys, row):
+        """Baut aus einer gecachten Zeile ein Modell-Objekt, das sich wie ein geladenes, losgelöstes verhält."""
+        entity = model(**dict(zip(keys, row)))
+        make_transient_to_detached(entity)
+        return entity
+
+    def cache_stats(self):
+        """Gibt die Treffer-/Fehlzugriffsstatistik des Query-Caches zurück."""
+        return self.query_cache.stats()
+
+    def clear_cache(self):
+        """Verwirft alle gecachten Ergebnisse (z.B. vor einem vom Benutzer ausgelösten Neuladen)."""
+        self.query_cache.clear()
+
+    @instrumented
     def add_entry(self, entry_object):
         """Fügt einen neuen Eintrag in die Datenbank ein."""
         session = self.Session()
@@ -124,11 +323,12 @@ class DBManager:
         finally:
             session.close()
 
+    @instrumented
     def get_all_code_analysis_reports(self):
         """Ruft alle CodeAnalysisReport-Einträge ab."""
         session = self.Session()
         try:
-            reports = session.query(CodeAnalysisReport).all()
+            reports = self._cached_all(session.query(CodeAnalysisReport), CodeAnalysisReport.__tablename__)
             return reports
         except Exception as e:
             print(f"FEHLER beim Abrufen der Code-Analyse-Berichte: {e}")
@@ -136,11 +336,100 @@ class DBManager:
         finally:
             session.close()
 
+    @instrumented
+    def get_code_analysis_report_summaries(self, limit=None, offset=0, preview_length=PREVIEW_LENGTH,
+                                           severity=None, status=None, issue_type=None, scan_id=None):
+        """
+        Ruft schmale Zeilen für Listenansichten ab: statt der vollständigen
+        description/code_snippet-Texte werden nur in SQL gekürzte Vorschauen geladen.
+        Optional nach severity, status, issue_type und scan_id gefiltert.
+
+        Returns:
+            Liste von Zeilen (benannte Tupel) mit den Feldern id, file_path, issue_type,
+            severity, description_preview, line_number, snippet_preview, analysis_date, status.
+        """
+        session = self.Session()
+        try:
+            query = session.query(
+                CodeAnalysisReport.id,
+                CodeAnalysisReport.file_path,
+                CodeAnalysisReport.issue_type,
+                CodeAnalysisReport.severity,
+                _preview(CodeAnalysisReport.description, preview_length).label("description_preview"),
+                CodeAnalysisReport.line_number,
+                _preview(CodeAnalysisReport.code_snippet, preview_length).label("snippet_preview"),
+                CodeAnalysisReport.analysis_date,
+                CodeAnalysisReport.status,
+            )
+            filters = {"severity": severity, "status": status, "issue_type": issue_type, "scan_id": scan_id}
+            query = query.filter_by(**{name: value for name, value in filters.items() if value is not None})
+            query = query.order_by(CodeAnalysisReport.id)
+            if limit is not None:
+                query = query.limit(limit)
+            if offset:
+                query = query.offset(offset)
+            return self._cached_all(query, CodeAnalysisReport.__tablename__)
+        except Exception as e:
+            print(f"FEHLER beim Abrufen der Berichtsübersicht: {e}")
+            return []
+        finally:
+            session.close()
+
+    @instrumented
+    def get_code_analysis_report(self, report_id):
+        """Ruft einen einzelnen CodeAnalysisReport vollständig (inkl. Texte) anhand der ID ab."""
+        session = self.Session()
+        try:
+            query = session.query(CodeAnalysisReport).filter_by(id=report_id)
+            reports = self._cached_all(query, CodeAnalysisReport.__tablename__)
+            return reports[0] if reports else None
+        except Exception as e:
+            print(f"FEHLER beim Abrufen des Berichts {report_id}: {e}")
+            return None
+        finally:
+            session.close()
+
+    def _count_reports_by(self, column):
+        """Zählt CodeAnalysisReports gruppiert nach einer Spalte."""
+        session = self.Session()
+        try:
+            query = session.query(column, func.count(CodeAnalysisReport.id)).group_by(column)
+            return dict(self._cached_all(query, CodeAnalysisReport.__tablename__))
+        except Exception as e:
+            print(f"FEHLER beim Zählen der Berichte: {e}")
+            return {}
+        finally:
+            session.close()
+
+    @instrumented
+    def count_rows(self, model):
+        """Gibt die Anzahl der Zeilen in der Tabelle eines Modells zurück."""
+        session = self.Session()
+        try:
+            query = session.query(func.count()).select_from(model)
+            return self._cached_all(query, model.__tablename__)[0][0]
+        except Exception as e:
+            print(f"FEHLER beim Zählen der Zeilen in '{model.__tablename__}': {e}")
+            return 0
+        finally:
+            session.close()
+
+    @instrumented
+    def count_reports_by_severity(self):
+        """Gibt die Anzahl der CodeAnalysisReports je Severity als Dict zurück."""
+        return self._count_reports_by(CodeAnalysisReport.severity)
+
+    @instrumented
+    def count_reports_by_status(self):
+        """Gibt die Anzahl der CodeAnalysisReports je Status als Dict zurück."""
+        return self._count_reports_by(CodeAnalysisReport.status)
+
+    @instrumented
     def get_all_scans(self):
         """Ruft alle Scan-Einträge ab."""
         session = self.Session()
         try:
-            scans = session.query(Scan).all()
+            scans = self._cached_all(session.query(Scan), Scan.__tablename__)
             return scans
         except Exception as e:
             print(f"FEHLER beim Abrufen der Scans: {e}")
@@ -148,7 +437,39 @@ class DBManager:
         finally:
             session.close()
 
+    @instrumented
+    def get_scan_targets(self):
+        """
+        Aggregiert die Scans je Ziel und Scan-Typ in SQL (für die Netzwerk-Topologie),
+        statt alle Scan-Zeilen samt results-JSON zu laden.
+
+        Returns:
+            Liste von Zeilen mit den Feldern target, scan_type, scans, failed, reports, last_seen.
+        """
+        session = self.Session()
+        try:
+            reports_per_scan = session.query(
+                CodeAnalysisReport.scan_id.label("scan_id"),
+                func.count(CodeAnalysisReport.id).label("reports"),
+            ).group_by(CodeAnalysisReport.scan_id).subquery()
+            query = session.query(
+                Scan.target,
+                Scan.scan_type,
+                func.count(Scan.id).label("scans"),
+                func.sum(case((Scan.status == 'failed', 1), else_=0)).label("failed"),
+                func.coalesce(func.sum(reports_per_scan.c.reports), 0).label("reports"),
+                func.max(Scan.start_time).label("last_seen"),
+            ).outerjoin(reports_per_scan, reports_per_scan.c.scan_id == Scan.id)
+            query = query.filter(Scan.target.isnot(None)).group_by(Scan.target, Scan.scan_type)
+            return self._cached_all(query, Scan.__tablename__, CodeAnalysisReport.__tablename__)
+        except Exception as e:
+            print(f"FEHLER beim Abrufen der Scan-Ziele: {e}")
+            return []
+        finally:
+            session.close()
+
     # Beispiel für eine Update-Methode (kann bei Bedarf erweitert werden)
+    @instrumented
     def update_report_status(self, report_id, new_status):
         """Aktualisiert den Status eines CodeAnalysisReport."""
         session = self.Session()
@@ -169,7 +490,96 @@ class DBManager:
         finally:
             session.close()
 
+    @instrumented
+    def update_report_statuses(self, report_ids, new_status):
+        """
+        Setzt den Status mehrerer CodeAnalysisReports in einem Statement.
+
+        Returns:
+            Anzahl der tatsächlich aktualisierten Berichte (-1 bei Fehler).
+        """
+        reports = CodeAnalysisReport.__table__
+        try:
+            with self.engine.begin() as conn:
+                result = conn.execute(reports.update()
+                                      .where(reports.c.id.in_(list(report_ids)))
+                                      .values(status=new_status))
+            print(f"INFO: Status für {result.rowcount} Berichte auf '{new_status}' aktualisiert.")
+            return result.rowcount
+        except Exception as e:
+            print(f"FEHLER beim Aktualisieren der Berichtsstatus: {e}")
+            return -1
+
+    @instrumented
+    def bulk_insert(self, model, rows, batch_size=1000):
+        """
+        Fügt Zeilen (Dicts mit Spaltennamen) gestreamt in die Tabelle des Modells ein.
+        Jeder Batch läuft in einer eigenen Transaktion, rows darf ein Generator sein.
+        Zeilen dürfen unterschiedliche Spalten enthalten (optionale Felder); ein Batch
+        wird vorzeitig geschrieben, sobald sich die Spaltenmenge ändert, da ein
+        executemany-Insert für alle Zeilen dieselben Spalten erwartet.
+        Fehler beim Lesen von rows (z.B. ungültige Eingabedaten) werden an den Aufrufer
+        weitergereicht; bereits eingefügte Batches bleiben erhalten.
+
+        Returns:
+            Anzahl der eingefügten Zeilen (bis zum ersten fehlerhaften Batch).
+        """
+        table = model.__table__
+        inserted = 0
+        batch = []
+
+        def flush():
+            nonlocal inserted, batch
+            with self.engine.begin() as conn:
+                conn.execute(table.insert(), batch)
+            inserted += len(batch)
+            batch = []
+
+        try:
+            for row in rows:
+                if batch and row.keys() != batch[0].keys():
+                    flush()
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    flush()
+            if batch:
+                flush()
+        except SQLAlchemyError as e:
+            print(f"FEHLER beim Bulk-Insert in '{table.name}' nach {inserted} Zeilen: {e}")
+        except Exception:
+            print(f"FEHLER beim Lesen der Zeilen für '{table.name}', {inserted} Zeilen wurden bereits eingefügt.")
+            raise
+        print(f"INFO: {inserted} Zeilen in '{table.name}' eingefügt.")
+        return inserted
+
+    def iter_rows(self, model, batch_size=1000, limit=None, offset=0, **filters):
+        """
+        Liefert die Zeilen der Tabelle eines Modells als Generator (ohne ORM-Objekte),
+        optional per Gleichheit auf Spalten gefiltert. Geeignet für Exporte großer Tabellen.
+        """
+        table = model.__table__
+        query = table.select().order_by(*table.primary_key.columns)
+        for name, value in filters.items():
+            if value is not None:
+                query = query.where(table.c[name] == value)
+        if limit is not None:
+            query = query.limit(limit)
+        if offset:
+            query = query.offset(offset)
+        with self.engine.connect() as conn:
+            last_sql_event()
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(query)
+            sql_event = last_sql_event()
+            count = 0
+            try:
+                for row in result:
+                    count += 1
+                    yield row
+            finally:
+                set_fetched_rows(sql_event, count)
+
     # Beispiel für eine Delete-Methode (kann bei Bedarf erweitert werden)
+    @instrumented
     def delete_entry(self, entry_object):
         """Löscht einen Eintrag aus der Datenbank."""
         session = self.Session()
@@ -185,6 +595,260 @@ class DBManager:
         finally:
             session.close()
 
+    # --- Report-Snapshots ---
+
+    @instrumented
+    def write_report_snapshot(self, scan_id, path):
+        """
+        Schreibt alle CodeAnalysisReports eines Scans in eine memory-mapped
+        Snapshot-Datei (siehe report_snapshot), die ohne Datenbank geöffnet werden kann.
+
+        Returns:
+            Anzahl der geschriebenen Berichte oder -1 bei Fehler.
+        """
+        try:
+            session = self.Session()
+            try:
+                scan = session.get(Scan, scan_id)
+                metadata = {"db_path": os.path.abspath(self.db_path), "scan_id": scan_id}
+                if scan is not None:
+                    metadata.update(scan_type=scan.scan_type, target=scan.target, status=scan.status,
+                                    start_time=scan.start_time, end_time=scan.end_time)
+            finally:
+                session.close()
+            count = write_snapshot(path, self.iter_rows(CodeAnalysisReport, scan_id=scan_id), metadata)
+            print(f"INFO: Snapshot mit {count} Berichten für Scan {scan_id} nach '{path}' geschrieben.")
+            return count
+        except Exception as e:
+            print(f"FEHLER beim Schreiben des Snapshots für Scan {scan_id}: {e}")
+            return -1
+
+    # --- Retention / Archivierung ---
+
+    def _archive_path(self, month):
+        """Pfad der Archiv-Datenbank für einen Monat im Format 'YYYY-MM'."""
+        base_name = os.path.splitext(os.path.basename(self.db_path))[0]
+        return os.path.join(self.archive_dir, f"{base_name}_{month}.db")
+
+    def _ensure_archive(self, month):
+        """Legt die Archiv-Datenbank für einen Monat samt Tabellen an, falls nötig."""
+        path = self._archive_path(month)
+        if not os.path.exists(path):
+            os.makedirs(self.archive_dir, exist_ok=True)
+            archive_engine = create_engine(f'sqlite:///{path}')
+            Base.metadata.create_all(archive_engine)
+            archive_engine.dispose()
+            print(f"INFO: Archiv '{path}' angelegt.")
+        return path
+
+    def _select_cold_scans(self, conn, policy, now, batch_size):
+        """Liefert (id, Monat) für höchstens batch_size Scans, auf die die Policy zutrifft."""
+        scans = Scan.__table__
+        # Scans ohne start_time (z.B. importiert) über end_time einordnen
+        scan_time = func.coalesce(scans.c.start_time, scans.c.end_time)
+        query = (scans.select()
+                 .with_only_columns(scans.c.id, scan_time.label("scan_time"))
+                 .where(scan_time < policy.cutoff(now))
+                 .order_by(scans.c.id)
+                 .limit(batch_size))
+        if policy.scan_type is not None:
+            query = query.where(scans.c.scan_type == policy.scan_type)
+        if policy.status is not None:
+            query = query.where(scans.c.status == policy.status)
+        return [(row.id, row.scan_time.strftime("%Y-%m")) for row in conn.execute(query)]
+
+    def _copy_to_archive(self, conn, month, scan_ids):
+        """Kopiert Scans und zugehörige Berichte per ATTACH in das Monats-Archiv."""
+        path = self._ensure_archive(month)
+        id_list = ",".join(str(int(scan_id)) for scan_id in scan_ids)
+        # ATTACH ist innerhalb einer offenen Transaktion nicht erlaubt
+        conn.exec_driver_sql("ATTACH DATABASE ? AS archive", (path,))
+        try:
+            for table, key in (("scans", "id"), ("code_analysis_reports", "scan_id")):
+                columns = ", ".join(c.name for c in Base.metadata.tables[table].columns)
+                conn.exec_driver_sql(
+                    f"INSERT OR REPLACE INTO archive.{table} ({columns}) "
+                    f"SELECT {columns} FROM main.{table} WHERE {key} IN ({id_list})")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.exec_driver_sql("DETACH DATABASE archive")
+
+    @instrumented
+    def apply_retention(self, policies, batch_size=500, max_batches=None, now=None):
+        """
+        Wendet Retention-Policies an: kalte Scans und ihre Berichte werden
+        in begrenzten Batches archiviert (Monats-Archive) und aus der aktiven DB gelöscht.
+        Anschließend wird freigewordener Speicher per incremental_vacuum zurückgegeben.
+
+        Args:
+            policies: Liste von RetentionPolicy-Objekten.
+            batch_size: Maximale Anzahl Scans pro Transaktion.
+            max_batches: Optionale Obergrenze an Batches pro Policy (None = bis alles erledigt ist).
+            now: Referenzzeitpunkt (Standard: jetzt).
+
+        Returns:
+            Dict mit der Anzahl entfernter Scans und Berichte.
+        """
+        removed = {"scans": 0, "reports": 0}
+        scans = Scan.__table__
+        reports = CodeAnalysisReport.__table__
+        with self.engine.connect() as conn:
+            for policy in policies:
+                batches = 0
+                while max_batches is None or batches < max_batches:
+                    cold = self._select_cold_scans(conn, policy, now, batch_size)
+                    conn.commit()
+                    if not cold:
+                        break
+                    try:
+                        if policy.archive:
+                            by_month = {}
+                            for scan_id, month in cold:
+                                by_month.setdefault(month, []).append(scan_id)
+                            for month, scan_ids in by_month.items():
+                                self._copy_to_archive(conn, month, scan_ids)
+                        scan_ids = [scan_id for scan_id, _ in cold]
+                        result = conn.execute(reports.delete().where(reports.c.scan_id.in_(scan_ids)))
+                        removed["reports"] += result.rowcount
+                        result = conn.execute(scans.delete().where(scans.c.id.in_(scan_ids)))
+                        removed["scans"] += result.rowcount
+                        conn.commit()
+                    except Exception as e:
+                        conn.rollback()
+                        print(f"FEHLER bei der Anwendung von {policy}: {e}")
+                        break
+                    batches += 1
+        print(f"INFO: Retention abgeschlossen: {removed['scans']} Scans, {removed['reports']} Berichte entfernt.")
+        self.incremental_vacuum()
+        return removed
+
+    @instrumented
+    def incremental_vacuum(self, pages=None):
+        """
+        Gibt freie Seiten an das Dateisystem zurück (PRAGMA incremental_vacuum).
+        pages=None gibt alle freien Seiten frei.
+        """
+        raw_connection = self.engine.raw_connection()
+        try:
+            cursor = raw_connection.cursor()
+            auto_vacuum = cursor.execute("PRAGMA auto_vacuum").fetchone()[0]
+            if auto_vacuum != 2:
+                print("WARNUNG: auto_vacuum ist nicht INCREMENTAL, einmalig enable_incremental_vacuum() ausführen.")
+                return False
+            pragma = "PRAGMA incremental_vacuum" if pages is None else f"PRAGMA incremental_vacuum({int(pages)})"
+            # executescript führt das Pragma vollständig aus; execute() gäbe nur eine Seite pro Aufruf frei
+            cursor.executescript(f"{pragma};")
+            cursor.close()
+            return True
+        except Exception as e:
+            print(f"FEHLER beim incremental_vacuum: {e}")
+            return False
+        finally:
+            raw_connection.close()
+
+    @instrumented
+    def enable_incremental_vacuum(self):
+        """
+        Stellt eine bestehende Datenbank auf auto_vacuum=INCREMENTAL um.
+        Erfordert ein einmaliges vollständiges VACUUM.
+        """
+        raw_connection = self.engine.raw_connection()
+        try:
+            # VACUUM darf nicht innerhalb einer Transaktion laufen
+            raw_connection.cursor().executescript("PRAGMA auto_vacuum=INCREMENTAL; VACUUM;")
+            print("INFO: auto_vacuum=INCREMENTAL aktiviert.")
+            return True
+        except Exception as e:
+            print(f"FEHLER beim Aktivieren von incremental_vacuum: {e}")
+            return False
+        finally:
+            raw_connection.close()
+
+    @instrumented
+    def list_archives(self):
+        """Gibt die vorhandenen Archiv-Monate ('YYYY-MM') sortiert zurück."""
+        pattern = self._archive_path("*")
+        prefix_len = len(self._archive_path("")) - len(".db")
+        months = (path[prefix_len:-len(".db")] for path in glob.glob(pattern))
+        return sorted(month for month in months if _MONTH_PATTERN.match(month))
+
+    @instrumented
+    def open_archive(self, month):
+        """
+        Öffnet ein Monats-Archiv schreibgeschützt für historische Abfragen.
+
+        Die Engine wird pro Monat wiederverwendet und erst von close_archives freigegeben.
+
+        Returns:
+            Eine Session-Factory (sessionmaker) auf das Archiv oder None, falls es nicht existiert.
+
+        Raises:
+            ValueError: month hat nicht das Format 'YYYY-MM'.
+        """
+        path = self._archive_path(_check_month(month))
+        if not os.path.exists(path):
+            print(f"WARNUNG: Kein Archiv für {month} vorhanden.")
+            return None
+        archive_engine = self._archive_engines.get(month)
+        if archive_engine is None:
+            archive_engine = create_engine(f'sqlite:///file:{path}?mode=ro&uri=true')
+            self._archive_engines[month] = archive_engine
+        return sessionmaker(bind=archive_engine)
+
+    def close_archives(self):
+        """Gibt die Engines (Verbindungspools, Dateihandles) aller per open_archive geöffneten Archive frei."""
+        for archive_engine in self._archive_engines.values():
+            archive_engine.dispose()
+        self._archive_engines.clear()
+
+    @staticmethod
+    def archive_schema(month):
+        """
+        Schema-Name, unter dem attach_archives das Archiv eines Monats anhängt (z. B. 'archive_2024_03').
+        Der Monat wird geprüft, da der Name direkt in ATTACH/DETACH eingesetzt wird.
+        """
+        return "archive_" + _check_month(month).replace("-", "_")
+
+    @instrumented
+    def attach_archives(self, conn, months):
+        """
+        Hängt Monats-Archive schreibgeschützt an eine Verbindung der aktiven Datenbank an,
+        damit sie zusammen mit ihr abgefragt werden können, z. B.
+        "SELECT ... FROM main.scans UNION ALL SELECT ... FROM archive_2024_03.scans".
+        ATTACH ist nicht innerhalb einer offenen Schreibtransaktion erlaubt; SQLite erlaubt
+        standardmäßig höchstens 10 angehängte Datenbanken.
+
+        Args:
+            conn: Verbindung aus self.engine.connect().
+            months: Monate im Format 'YYYY-MM'; nicht vorhandene Archive werden übersprungen.
+
+        Returns:
+            Dict Monat -> Schema-Name der angehängten Archive. Mit detach_archives wieder lösen.
+
+        Raises:
+            ValueError: ein Monat hat nicht das Format 'YYYY-MM'.
+        """
+        attached = {}
+        for month in months:
+            schema = self.archive_schema(month)
+            path = self._archive_path(month)
+            if not os.path.exists(path):
+                print(f"WARNUNG: Kein Archiv für {month} vorhanden.")
+                continue
+            uri = "file:" + path.replace("%", "%25").replace("?", "%3f").replace("#", "%23") + "?mode=ro"
+            conn.exec_driver_sql(f"ATTACH DATABASE ? AS {schema}", (uri,))
+            attached[month] = schema
+        return attached
+
+    @instrumented
+    def detach_archives(self, conn, months):
+        """Löst die per attach_archives angehängten Archive wieder von der Verbindung."""
+        for month in months:
+            conn.exec_driver_sql(f"DETACH DATABASE {self.archive_schema(month)}")
+
 # Beispielnutzung und Dummy-Daten für den Proto-Release
 if __name__ == "__main__":
     db_manager = DBManager()
@@ -307,3 +971,10 @@ if __name__ == "__main__":
     # all_reports_after_delete = db_manager.get_all_code_analysis_reports()
     # for report in all_reports_after_delete:
     #     print(report)
+
+    # Beispiel: Alte Scans archivieren (Monats-Archive unter ./archive)
+    # db_manager.apply_retention([
+    #     RetentionPolicy(max_age_days=90, status='completed'),
+    #     RetentionPolicy(max_age_days=30, status='failed', archive=False),
+    # ])
+    # print(db_manager.list_archives())
@@ -0,0 +1,237 @@
+# instrumentation.py
+
+# Strukturierte Laufzeit-Messungen für Tesseract.
+# Sammelt SQL-Statements (per SQLAlchemy-Events), DBManager-Methodenaufrufe,
+# Tk-Event-Loop-Verzögerungen und Plugin-Updates in einem Ringpuffer.
+# Bewusst ohne GUI-Abhängigkeiten, damit auch Skripte ohne Display es nutzen können.
+
+import collections
+import contextlib
+import functools
+import itertools
+import json
+import threading
+import time
+
+from sqlalchemy import event
+
+# Ereignisarten im Ringpuffer
+KIND_SQL = "sql"
+KIND_DB_METHOD = "db_method"
+KIND_EVENT_LOOP = "event_loop"
+KIND_PLUGIN = "plugin"
+
+DEFAULT_CAPACITY = 5000
+DEFAULT_SLOW_THRESHOLD_MS = 100.0
+
+_call_context = threading.local()
+
+
+def _current_method():
+    """Gibt den Namen der innersten laufenden DBManager-Methode im aktuellen Thread zurück."""
+    stack = getattr(_call_context, "stack", None)
+    return stack[-1] if stack else None
+
+
+class Instrumentation:
+    """
+    Thread-sicherer Ringpuffer für Messereignisse mit Slow-Query-Schwelle.
+    Jedes Ereignis ist ein Dict mit mindestens 'seq', 'time', 'kind', 'name',
+    'duration_ms' und 'slow'; je nach Art kommen weitere Felder hinzu.
+    """
+    def __init__(self, capacity=DEFAULT_CAPACITY, slow_threshold_ms=DEFAULT_SLOW_THRESHOLD_MS):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.enabled = True
+        self._events = collections.deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+
+    def record(self, kind, name, duration_ms, **details):
+        """Legt ein Ereignis im Ringpuffer ab und gibt es zurück."""
+        if not self.enabled:
+            return None
+        entry = {
+            "seq": next(self._seq),
+            "time": time.time(),
+            "kind": kind,
+            "name": name,
+            "duration_ms": round(duration_ms, 3),
+            "slow": duration_ms >= self.slow_threshold_ms,
+        }
+        entry.update(details)
+        with self._lock:
+            self._events.append(entry)
+        return entry
+
+    @contextlib.contextmanager
+    def measure(self, kind, name, **details):
+        """Kontextmanager, der die Laufzeit des umschlossenen Blocks aufzeichnet."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name, (time.perf_counter() - start) * 1000.0, **details)
+
+    def events(self, since_seq=0, kind=None, slow_only=False):
+        """
+        Gibt eine Kopie der Ereignisse mit seq > since_seq zurück (optional gefiltert).
+        slow_only liefert langsame und fehlgeschlagene Ereignisse (Feld 'error').
+        """
+        with self._lock:
+            snapshot = list(self._events)
+        return [e for e in snapshot
+                if e["seq"] > since_seq
+                and (kind is None or e["kind"] == kind)
+                and (not slow_only or e["slow"] or e.get("error"))]
+
+    def slow_events(self):
+        """Alle Ereignisse über der Slow-Query-Schwelle sowie fehlgeschlagene Statements."""
+        return self.events(slow_only=True)
+
+    def clear(self):
+        """Leert den Ringpuffer."""
+        with self._lock:
+            self._events.clear()
+
+    def dump(self, path):
+        """
+        Schreibt den aktuellen Pufferinhalt als JSON Lines in eine Datei.
+
+        Returns:
+            Anzahl der geschriebenen Ereignisse.
+        """
+        events = self.events()
+        with open(path, "w", encoding="utf-8") as f:
+            for entry in events:
+                f.write(json.dumps(entry, default=str) + "\n")
+        print(f"INFO: {len(events)} Messereignisse nach '{path}' geschrieben.")
+        return len(events)
+
+    def attach_engine(self, engine):
+        """
+        Registriert SQLAlchemy-Event-Hooks, die für jedes Statement Latenz,
+        betroffene Zeilen und die aufrufende DBManager-Methode erfassen.
+        """
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Startzeit je Cursor, damit fehlgeschlagene Statements (ohne after_cursor_execute)
+        # keinen Eintrag auf der gepoolten Verbindung zurücklassen
+        conn.info.setdefault("_tesseract_query_start", {})[id(cursor)] = time.perf_counter()
+
+    def _pop_start(self, conn, cursor):
+        starts = conn.info.get("_tesseract_query_start") if conn is not None else None
+        return starts.pop(id(cursor), None) if starts and cursor is not None else None
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = self._pop_start(conn, cursor)
+        if start is None:
+            return
+        duration_ms = (time.perf_counter() - start) * 1000.0
+        # SQLite liefert rowcount nur für DML; für SELECTs ist es -1. Die gelesenen Zeilen
+        # trägt der Aufrufer nach dem Holen per set_fetched_rows nach (siehe last_sql_event)
+        rowcount = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+        _call_context.last_sql = self.record(KIND_SQL, " ".join(statement.split())[:200], duration_ms,
+                                             rows=rowcount, method=_current_method(), executemany=executemany)
+
+    def _handle_error(self, exception_context):
+        """Zeichnet fehlgeschlagene Statements samt Fehlermeldung auf."""
+        statement = exception_context.statement
+        cursor = getattr(exception_context.execution_context, "cursor", None)
+        start = self._pop_start(exception_context.connection, cursor)
+        if statement is None:
+            return
+        duration_ms = (time.perf_counter() - start) * 1000.0 if start is not None else 0.0
+        error = exception_context.original_exception
+        self.record(KIND_SQL, " ".join(statement.split())[:200], duration_ms,
+                    method=_current_method(), error=f"{type(error).__name__}: {error}")
+
+
+def last_sql_event():
+    """
+    Gibt das zuletzt im aktuellen Thread aufgezeichnete SQL-Ereignis zurück (oder None)
+    und vergisst es. Direkt nach dem Ausführen einer Abfrage aufrufen, um später
+    per set_fetched_rows die Anzahl der tatsächlich gelesenen Zeilen nachzutragen.
+    """
+    entry = getattr(_call_context, "last_sql", None)
+    _call_context.last_sql = None
+    return entry
+
+
+def set_fetched_rows(entry, count):
+    """Trägt die Anzahl gelesener Zeilen in ein SQL-Ereignis ein (entry darf None sein)."""
+    if entry is not None and entry.get("rows") is None:
+        entry["rows"] = count
+
+
+def instrumented(func):
+    """
+    Dekorator für DBManager-Methoden: misst den gesamten Aufruf und macht den
+    Methodennamen für die darin ausgeführten SQL-Statements sichtbar.
+    Wirft die Methode eine Ausnahme, wird der Aufruf mit Feld 'error' aufgezeichnet.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        stack = getattr(_call_context, "stack", None)
+        if stack is None:
+            stack = _call_context.stack = []
+        stack.append(func.__name__)
+        start = time.perf_counter()
+        result = error = None
+        try:
+            result = func(self, *args, **kwargs)
+            return result
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stack.pop()
+            duration_ms = (time.perf_counter() - start) * 1000.0
+            if error is not None:
+                self.instrumentation.record(KIND_DB_METHOD, func.__name__, duration_ms, rows=None, error=error)
+            else:
+                rows = len(result) if isinstance(result, (list, tuple)) else None
+                self.instrumentation.record(KIND_DB_METHOD, func.__name__, duration_ms, rows=rows)
+    return wrapper
+
+
+def _plugin_instrumentation(plugin):
+    """Instrumentierung eines Plugins: eigene, die seines DBManagers oder die prozessweite."""
+    instrumentation = getattr(plugin, "instrumentation", None)
+    if instrumentation is None:
+        instrumentation = getattr(getattr(plugin, "db_manager", None), "instrumentation", None)
+    return instrumentation or get_instrumentation()
+
+
+def instrumented_plugin(func=None, *, min_duration_ms=0.0):
+    """
+    Dekorator für Plugin-Methoden (update_gui, Refresh-Pfade): zeichnet jeden Aufruf
+    als KIND_PLUGIN-Ereignis "<Plugin-Name>.<Methode>" auf, egal von wo er ausgelöst wird
+    (Polling per after(), Button, Metavisualizer). Aufrufe unter min_duration_ms werden
+    nicht aufgezeichnet, damit häufiges Polling den Ringpuffer nicht füllt.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                duration_ms = (time.perf_counter() - start) * 1000.0
+                if duration_ms >= min_duration_ms:
+                    _plugin_instrumentation(self).record(KIND_PLUGIN, f"{self.name}.{func.__name__}", duration_ms)
+        return wrapper
+    return decorate(func) if func is not None else decorate
+
+
+_default_instrumentation = None
+
+
+def get_instrumentation():
+    """Gibt die prozessweite Standard-Instrumentierung zurück (wird bei Bedarf angelegt)."""
+    global _default_instrumentation
+    if _default_instrumentation is None:
+        _default_instrumentation = Instrumentation()
+    return _default_instrumentation
@@ -13,6 +13,9 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # Importieren Sie die notwendigen Komponenten
 from plugin_manager import PluginManager
 from plugins.gui_stream_base import apply_dark_theme # Für das dunkle Thema
+from plugins.system_log_viewer import SystemLogViewer
+from plugins.network_topology_viewer import NetworkTopologyViewer
+from instrumentation import KIND_PLUGIN
 # Stellen Sie sicher, dass db_manager_updated.py im selben Verzeichnis ist
 from db_manager_updated import DBManager 
 
@@ -51,11 +54,11 @@ class MetavisualizerApp:
         tk.Label(self.overview_frame, text="Aktive Module, Netzwerk-Status, etc. werden hier visualisiert.", 
                  foreground="#00FFCC", background="#222222", font=("Consolas", 12)).pack(pady=10)
 
-        # 2. Netzwerk-Scans Tab (Platzhalter)
-        self.scan_frame = ttk.Frame(self.notebook, style="TFrame")
+        # 2. Netzwerk-Scans Tab: Topologie-/Heatmap-Ansicht der Scan-Ziele
+        self.network_topology = NetworkTopologyViewer(self.db_manager)
+        self.scan_frame = self.network_topology.create_gui(self.notebook)
         self.notebook.add(self.scan_frame, text="Netzwerk-Scans")
-        tk.Label(self.scan_frame, text="Hier werden Netzwerk-Scans gesteuert und angezeigt.", 
-                 foreground="#00FFCC", background="#222222", font=("Consolas", 16)).pack(pady=50)
+        self._call_plugin(self.network_topology, "run")
         
         # 3. Modul-Manager Tab (Platzhalter)
         self.module_frame = ttk.Frame(self.notebook, style="TFrame")
@@ -64,11 +67,11 @@ class MetavisualizerApp:
                  foreground="#00FFCC", background="#222222", font=("Consolas", 16)).pack(pady=50)
 
         # Der Jan's Eye Reports Tab wird dynamisch hinzugefügt
-        # 4. System-Log Tab (Platzhalter)
-        self.log_frame = ttk.Frame(self.notebook, style="TFrame")
+        # 4. System-Log Tab: Live-Ansicht der Query-Instrumentierung und des Slow-Query-Logs
+        self.system_log = SystemLogViewer(self.db_manager.instrumentation)
+        self.log_frame = self.system_log.create_gui(self.notebook)
         self.notebook.add(self.log_frame, text="System-Log")
-        tk.Label(self.log_frame, text="Hier werden die System-Logs angezeigt (Midori-Integration).", 
-                 foreground="#00FFCC", background="#222222", font=("Consolas", 16)).pack(pady=50)
+        self.system_log.run()
 
     def _load_and_integrate_plugins(self):
         """
@@ -84,7 +87,7 @@ class MetavisualizerApp:
             # Fügt den Frame als neuen Tab hinzu
             self.notebook.add(plugin_gui_frame, text=jan_eye_viewer_plugin.name)
             # Startet das Plugin (führt initial update_gui aus)
-            jan_eye_viewer_plugin.run()
+            self._call_plugin(jan_eye_viewer_plugin, "run")
             print(f"'{jan_eye_viewer_plugin.name}' Plugin-Tab hinzugefügt und gestartet.")
         else:
             print("WARNUNG: 'Jan's Eye Reports' Plugin nicht gefunden. Stellen Sie sicher, dass 'jan_eye_report_viewer.py' existiert.")
@@ -99,6 +102,15 @@ class MetavisualizerApp:
         #     print(f"'{meta_inspector_plugin.name}' Plugin-Tab hinzugefügt und gestartet.")
 
 
+    def _call_plugin(self, plugin, method_name, **kwargs):
+        """
+        Ruft eine Plugin-Methode (z.B. run) auf und zeichnet ihre Laufzeit im System-Log auf.
+        update_gui und die Refresh-Pfade der Plugins sind selbst per @instrumented_plugin
+        gemessen, auch wenn sie per after() oder Button ausgelöst werden.
+        """
+        with self.db_manager.instrumentation.measure(KIND_PLUGIN, f"{plugin.name}.{method_name}"):
+            return getattr(plugin, method_name)(**kwargs)
+
     def _periodic_plugin_update(self):
         """
         Führt regelmäßige Updates für Plugins aus, die dies benötigen.
@@ -106,7 +118,7 @@ class MetavisualizerApp:
         # Beispiel: Wenn JanEyeReportViewer regelmäßige Updates benötigt
         jan_eye_viewer_plugin = self.plugin_manager.get_plugin("Jan's Eye Reports")
         if jan_eye_viewer_plugin:
-            # jan_eye_viewer_plugin.update_gui() # Nur aufrufen, wenn wirklich nötig und nicht zu oft
+            # self._call_plugin(jan_eye_viewer_plugin, "update_gui") # Nur aufrufen, wenn wirklich nötig und nicht zu oft
             pass # Der JanEyeReportViewer hat bereits einen Refresh-Button
 
         self.root.after(5000, self._periodic_plugin_update) # Alle 5 Sekunden wiederholen
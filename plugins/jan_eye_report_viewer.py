@@ -3,7 +3,10 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
+from tkinter import filedialog
+import collections
 import datetime
+import types
 import sys
 import os
 
@@ -13,7 +16,10 @@ if '..' not in sys.path:
     sys.path.insert(0, '..')
 
 from plugins.gui_stream_base import GUIStreamPluginBase
-from db_manager_updated import DBManager, CodeAnalysisReport # Importieren Sie DBManager und das Modell
+from db_manager_updated import DBManager, CodeAnalysisReport, PREVIEW_LENGTH # Importieren Sie DBManager und das Modell
+from report_snapshot import ReportSnapshot, SnapshotFormatError, FILE_EXTENSION
+from plugins.report_table import ReportTable
+from instrumentation import instrumented_plugin
 
 class JanEyeReportViewer(GUIStreamPluginBase):
     """
@@ -27,10 +33,37 @@ class JanEyeReportViewer(GUIStreamPluginBase):
     author = "Jan (M4tth4ck333)"
     version = "0.1"
 
-    def __init__(self):
+    detail_cache_size = 32 # Anzahl zuletzt geöffneter Berichte, die vollständig im Speicher bleiben
+    max_display_rows = 10000 # Obergrenze der Treeview-Zeilen; Sortieren/Filtern läuft immer über alle Berichte
+    filter_delay_ms = 250 # Verzögerung des Schnellfilters nach der letzten Eingabe
+
+    # Treeview-Spalte -> Spalte im ReportTable
+    column_keys = {
+        "ID": "id",
+        "File Path": "file_path",
+        "Issue Type": "issue_type",
+        "Severity": "severity",
+        "Description": "description_preview",
+        "Line": "line_number",
+        "Snippet": "snippet_preview",
+        "Date": "analysis_date",
+        "Status": "status",
+    }
+
+    def __init__(self, db_manager=None):
         super().__init__()
-        self.db_manager = DBManager() # Initialisiert den DBManager
+        # Optional einen bestehenden DBManager übergeben (z.B. für Benchmarks), sonst Standard-DB
+        self.db_manager = db_manager or DBManager()
         self.reports_tree = None # Treeview-Widget für die Berichte
+        self._detail_cache = collections.OrderedDict() # report_id -> vollständiger CodeAnalysisReport
+        self.snapshot = None # Geöffneter ReportSnapshot (schreibgeschützt) statt der Live-DB
+        self.title_var = None
+        self.report_table = ReportTable() # Spaltenorientiertes Modell der angezeigten Berichte
+        self.sort_keys = [("id", False)] # (Spalte, absteigend); erster Eintrag hat Vorrang
+        self.filter_var = None
+        self.summary_var = None
+        self._filter_after_id = None
+        self._decode_after_id = None # Schrittweises Dekodieren der Snapshot-Texte im Leerlauf
 
     def create_gui(self, parent):
         """
@@ -39,24 +72,39 @@ class JanEyeReportViewer(GUIStreamPluginBase):
         # Erstellt einen Frame, der als Container für die Plugin-GUI dient
         frame = super().create_gui(parent)
         frame.columnconfigure(0, weight=1)
-        frame.rowconfigure(1, weight=1) # Die Tabelle soll sich ausdehnen
+        frame.rowconfigure(2, weight=1) # Die Tabelle soll sich ausdehnen
 
-        # Titel-Label
-        title_label = ttk.Label(frame, text="Jan's Eye Code Analysis Reports", font=("Consolas", 14, "bold"), foreground="#00FFCC", background="#222222")
+        # Titel-Label (zeigt bei geöffnetem Snapshot dessen Dateinamen)
+        self.title_var = tk.StringVar(value="Jan's Eye Code Analysis Reports")
+        title_label = ttk.Label(frame, textvariable=self.title_var, font=("Consolas", 14, "bold"), foreground="#00FFCC", background="#222222")
         title_label.grid(row=0, column=0, columnspan=2, pady=10, sticky="ew")
 
-        # Refresh Button
-        refresh_button = ttk.Button(frame, text="Refresh Reports", command=self.refresh_reports)
-        refresh_button.grid(row=0, column=1, padx=10, pady=10, sticky="e")
-        # Platzierung des Buttons rechts vom Titel, aber innerhalb des Grids
+        # Buttons rechts vom Titel, aber innerhalb des Grids
+        button_frame = ttk.Frame(frame, style="TFrame")
+        button_frame.grid(row=0, column=1, padx=10, pady=10, sticky="e")
+        ttk.Button(button_frame, text="Open Snapshot...", command=self.choose_snapshot).pack(side="left", padx=5)
+        ttk.Button(button_frame, text="Live DB", command=self.close_snapshot).pack(side="left", padx=5)
+        refresh_button = ttk.Button(button_frame, text="Refresh Reports", command=self.reload_reports)
+        refresh_button.pack(side="left", padx=5)
+
+        # Schnellfilter und Zusammenfassung (Anzahl je Severity der gefilterten Berichte)
+        filter_frame = ttk.Frame(frame, style="TFrame")
+        filter_frame.grid(row=1, column=0, columnspan=2, sticky="ew", padx=10)
+        filter_frame.columnconfigure(2, weight=1)
+        ttk.Label(filter_frame, text="Quick Filter:", font=("Consolas", 10, "bold")).grid(row=0, column=0, sticky="w")
+        self.filter_var = tk.StringVar(value="")
+        self.filter_var.trace_add("write", self._schedule_filter)
+        ttk.Entry(filter_frame, textvariable=self.filter_var, width=40).grid(row=0, column=1, sticky="w", padx=5)
+        self.summary_var = tk.StringVar(value="")
+        ttk.Label(filter_frame, textvariable=self.summary_var, font=("Consolas", 10)).grid(row=0, column=2, sticky="e")
 
         # Treeview für die Berichte
-        columns = ("ID", "File Path", "Issue Type", "Severity", "Description", "Line", "Snippet", "Date", "Status")
+        columns = tuple(self.column_keys)
         self.reports_tree = ttk.Treeview(frame, columns=columns, show="headings", style="Treeview")
 
-        # Spaltenüberschriften konfigurieren
+        # Spaltenüberschriften konfigurieren; Klick sortiert nach der Spalte
         for col in columns:
-            self.reports_tree.heading(col, text=col, anchor=tk.W)
+            self.reports_tree.heading(col, text=col, anchor=tk.W, command=lambda c=col: self.sort_by(c))
             self.reports_tree.column(col, width=100, stretch=True) # Standardbreite
 
         # Spezifische Spaltenbreiten anpassen
@@ -67,15 +115,15 @@ class JanEyeReportViewer(GUIStreamPluginBase):
         self.reports_tree.column("Line", width=50, minwidth=40, stretch=False)
         self.reports_tree.column("Status", width=80, minwidth=60)
 
-        self.reports_tree.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=10, pady=10)
+        self.reports_tree.grid(row=2, column=0, columnspan=2, sticky="nsew", padx=10, pady=10)
 
         # Scrollbars hinzufügen
         vsb = ttk.Scrollbar(frame, orient="vertical", command=self.reports_tree.yview)
-        vsb.grid(row=1, column=2, sticky="ns")
+        vsb.grid(row=2, column=2, sticky="ns")
         self.reports_tree.configure(yscrollcommand=vsb.set)
 
         hsb = ttk.Scrollbar(frame, orient="horizontal", command=self.reports_tree.xview)
-        hsb.grid(row=2, column=0, columnspan=2, sticky="ew")
+        hsb.grid(row=3, column=0, columnspan=2, sticky="ew")
         self.reports_tree.configure(xscrollcommand=hsb.set)
 
         # Event-Handler für Doppelklick auf einen Eintrag
@@ -83,37 +131,191 @@ class JanEyeReportViewer(GUIStreamPluginBase):
 
         return frame
 
+    @instrumented_plugin
     def refresh_reports(self):
         """
-        Lädt die Code-Analyse-Berichte aus der Datenbank neu und aktualisiert die Anzeige.
+        Lädt die Code-Analyse-Berichte aus der Datenbank (oder dem geöffneten Snapshot)
+        neu in das ReportTable-Modell und aktualisiert die Anzeige.
         """
+        self._cancel_decode()
+        if self.snapshot is not None:
+            self.report_table = ReportTable.from_snapshot(self.snapshot, PREVIEW_LENGTH)
+            source = f"Snapshot '{self.snapshot.path}'"
+        else:
+            # Nur schmale Spalten abrufen; Beschreibung und Snippet kommen als gekürzte Vorschau
+            self.report_table = ReportTable.from_summaries(self.db_manager.get_code_analysis_report_summaries())
+            source = "Datenbank"
+        self._drop_stale_details()
+        self.apply_view()
+        if self.snapshot is not None and self.gui_frame is not None:
+            # Texte für Sortierung und Schnellfilter vorab in kleinen Schritten dekodieren,
+            # damit der erste Klick darauf die GUI nicht blockiert
+            self._decode_after_id = self.gui_frame.after(1, self._decode_step, self.report_table.decode_steps())
+        print(f"INFO: {len(self.report_table)} Code-Analyse-Berichte aus {source} geladen und angezeigt.")
+
+    def reload_reports(self):
+        """
+        Vom Benutzer ausgelöstes Neuladen: liest die Berichte am Query-Cache vorbei
+        und verwirft auch die zwischengespeicherten Detailansichten.
+        """
+        if self.snapshot is None:
+            self.db_manager.clear_cache()
+        self._detail_cache.clear()
+        self.refresh_reports()
+
+    def _drop_stale_details(self):
+        """
+        Verwirft Detail-Cache-Einträge, deren Bericht im neu geladenen ReportTable fehlt
+        oder dort einen anderen Status hat (z.B. per CLI 'status' geändert).
+        """
+        table = self.report_table
+        for report_id, report in list(self._detail_cache.items()):
+            index = table.index_of(report_id)
+            if index is None or table.value("status", index) != report.status:
+                del self._detail_cache[report_id]
+
+    @instrumented_plugin
+    def apply_view(self):
+        """
+        Filtert und sortiert die Berichte im Speicher (ohne DB-Zugriff) und
+        füllt die Treeview neu.
+        """
+        table = self.report_table
+        quick_filter = self.filter_var.get().strip() if self.filter_var is not None else ""
+        indices = table.filter(text=quick_filter or None)
+        indices = table.sort(indices, self.sort_keys)
+
         # Vorhandene Einträge löschen
-        for item in self.reports_tree.get_children():
-            self.reports_tree.delete(item)
-
-        # Berichte aus der Datenbank abrufen
-        reports = self.db_manager.get_all_code_analysis_reports()
-
-        # Berichte in die Treeview einfügen
-        for report in reports:
-            # Formatieren des Datums für bessere Lesbarkeit
-            analysis_date_str = report.analysis_date.strftime("%Y-%m-%d %H:%M:%S") if report.analysis_date else ""
-            
-            # Zeilennummer als String behandeln, falls None
-            line_number_str = str(report.line_number) if report.line_number is not None else "N/A"
-
-            self.reports_tree.insert("", "end", values=(
-                report.id,
-                report.file_path,
-                report.issue_type,
-                report.severity,
-                report.description,
-                line_number_str,
-                report.code_snippet,
-                analysis_date_str,
-                report.status
-            ))
-        print(f"INFO: {len(reports)} Code-Analyse-Berichte geladen und angezeigt.")
+        self.reports_tree.delete(*self.reports_tree.get_children())
+
+        # Berichte in die Treeview einfügen (Bericht-ID als Item-ID für den Detailabruf)
+        for index in indices[:self.max_display_rows]:
+            self.reports_tree.insert("", "end", iid=str(table.ids[index]), values=self._row_values(index))
+
+        if self.summary_var is not None:
+            counts = "  ".join(f"{severity}: {count}" for severity, count in table.group_counts("severity", indices).items())
+            shown = f"{min(len(indices), self.max_display_rows)} of {len(indices)}"
+            self.summary_var.set(f"Showing {shown} (total {len(table)})   {counts}")
+
+    def _row_values(self, index):
+        """Formatiert eine Zeile des ReportTable für die Treeview."""
+        table = self.report_table
+        # Formatieren des Datums für bessere Lesbarkeit
+        analysis_date = table.value("analysis_date", index)
+        analysis_date_str = analysis_date.strftime("%Y-%m-%d %H:%M:%S") if analysis_date else ""
+        # Zeilennummer als String behandeln, falls None
+        line_number = table.value("line_number", index)
+        line_number_str = str(line_number) if line_number is not None else "N/A"
+        return (
+            table.ids[index],
+            table.text("file_path", index),
+            table.value("issue_type", index),
+            table.value("severity", index),
+            table.text("description_preview", index),
+            line_number_str,
+            table.text("snippet_preview", index),
+            analysis_date_str,
+            table.value("status", index),
+        )
+
+    def sort_by(self, column):
+        """
+        Sortiert nach einer Treeview-Spalte. Die geklickte Spalte wird Hauptschlüssel,
+        die bisherigen Schlüssel bleiben als Nebenschlüssel erhalten; erneuter Klick
+        kehrt die Richtung um.
+        """
+        key = self.column_keys[column]
+        current_key, current_descending = self.sort_keys[0]
+        descending = not current_descending if current_key == key else False
+        self.sort_keys = [(key, descending)] + [k for k in self.sort_keys if k[0] != key][:2]
+        for col, col_key in self.column_keys.items():
+            arrow = ""
+            if col_key == key:
+                arrow = " \u25bc" if descending else " \u25b2"
+            self.reports_tree.heading(col, text=col + arrow)
+        self.apply_view()
+
+    @instrumented_plugin(min_duration_ms=10.0)
+    def _decode_step(self, steps):
+        """Dekodiert einen Abschnitt der Snapshot-Texte und plant den nächsten ein."""
+        try:
+            next(steps)
+        except StopIteration:
+            self._decode_after_id = None
+            return
+        self._decode_after_id = self.gui_frame.after(1, self._decode_step, steps)
+
+    def _cancel_decode(self):
+        if self._decode_after_id is not None:
+            self.gui_frame.after_cancel(self._decode_after_id)
+            self._decode_after_id = None
+
+    def _schedule_filter(self, *args):
+        """Wendet den Schnellfilter erst nach einer kurzen Eingabepause an."""
+        if self._filter_after_id is not None:
+            self.gui_frame.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.gui_frame.after(self.filter_delay_ms, self._run_filter)
+
+    def _run_filter(self):
+        self._filter_after_id = None
+        self.apply_view()
+
+    def open_snapshot(self, path):
+        """
+        Öffnet eine Snapshot-Datei schreibgeschützt und zeigt deren Berichte an.
+        Gibt True bei Erfolg zurück.
+        """
+        try:
+            snapshot = ReportSnapshot(path)
+        except (OSError, SnapshotFormatError) as e:
+            print(f"FEHLER beim Öffnen des Snapshots '{path}': {e}")
+            return False
+        self.close_snapshot(refresh=False)
+        self.snapshot = snapshot
+        if self.title_var is not None:
+            self.title_var.set(f"Snapshot: {os.path.basename(path)} (read-only)")
+        self.refresh_reports()
+        return True
+
+    def choose_snapshot(self):
+        """Dateiauswahl für open_snapshot."""
+        path = filedialog.askopenfilename(parent=self.gui_frame, filetypes=[
+            ("Tesseract Snapshot", f"*{FILE_EXTENSION}"), ("Alle Dateien", "*.*")])
+        if path and not self.open_snapshot(path):
+            messagebox.showerror("Error", f"Snapshot '{path}' could not be opened.")
+
+    def close_snapshot(self, refresh=True):
+        """Schließt einen geöffneten Snapshot und kehrt zur Live-Datenbank zurück."""
+        if self.snapshot is not None:
+            self._cancel_decode()
+            self.snapshot.close()
+            self.snapshot = None
+            self._detail_cache.clear()
+            if self.title_var is not None:
+                self.title_var.set("Jan's Eye Code Analysis Reports")
+            if refresh:
+                self.refresh_reports()
+
+    def get_report_details(self, report_id):
+        """
+        Liefert den vollständigen Bericht zu report_id. Zuletzt geöffnete Berichte
+        werden in einem kleinen LRU-Cache gehalten, alle anderen bei Bedarf aus der DB
+        (bzw. per wahlfreiem Zugriff aus dem Snapshot) geladen.
+        """
+        if self.snapshot is not None:
+            index = self.snapshot.find(report_id)
+            return types.SimpleNamespace(**self.snapshot.row(index)) if index is not None else None
+
+        report = self._detail_cache.get(report_id)
+        if report is not None:
+            self._detail_cache.move_to_end(report_id)
+            return report
+        report = self.db_manager.get_code_analysis_report(report_id)
+        if report is not None:
+            self._detail_cache[report_id] = report
+            if len(self._detail_cache) > self.detail_cache_size:
+                self._detail_cache.popitem(last=False)
+        return report
 
     def on_item_double_click(self, event):
         """
@@ -124,18 +326,21 @@ class JanEyeReportViewer(GUIStreamPluginBase):
         if not selected_item:
             return
 
-        item_values = self.reports_tree.item(selected_item, "values")
-        
-        # Extrahieren der Daten
-        report_id = item_values[0]
-        file_path = item_values[1]
-        issue_type = item_values[2]
-        severity = item_values[3]
-        description = item_values[4]
-        line_number = item_values[5]
-        code_snippet = item_values[6]
-        analysis_date = item_values[7]
-        status = item_values[8]
+        # Vollständigen Bericht erst beim Öffnen laden (die Tabelle enthält nur Vorschauen)
+        report_id = int(selected_item[0])
+        report = self.get_report_details(report_id)
+        if report is None:
+            messagebox.showerror("Error", f"Report ID {report_id} not found.")
+            return
+
+        file_path = report.file_path
+        issue_type = report.issue_type
+        severity = report.severity
+        description = report.description or ""
+        line_number = str(report.line_number) if report.line_number is not None else "N/A"
+        code_snippet = report.code_snippet or ""
+        analysis_date = report.analysis_date.strftime("%Y-%m-%d %H:%M:%S") if report.analysis_date else ""
+        status = report.status
 
         # Detailfenster erstellen
         detail_window = tk.Toplevel(self.gui_frame)
@@ -184,6 +389,14 @@ class JanEyeReportViewer(GUIStreamPluginBase):
         add_detail_row("Analysis Date", analysis_date)
         add_detail_row("Status", status)
 
+        # Snapshots sind schreibgeschützt: kein Status-Update möglich
+        if self.snapshot is not None:
+            ttk.Label(detail_frame, text="Read-only snapshot", font=("Consolas", 10, "italic"), foreground="#00FFCC", background="#222222").grid(row=row_idx, column=1, sticky="nw", pady=10, padx=5)
+            detail_window.update_idletasks()
+            detail_window.geometry(f"+{self.gui_frame.winfo_x() + 50}+{self.gui_frame.winfo_y() + 50}")
+            detail_window.wait_window(detail_window)
+            return
+
         # Status-Dropdown zur Aktualisierung
         status_options = ["New", "Triaged", "FalsePositive", "Fixed", "Ignored"]
         current_status_var = tk.StringVar(value=status)
@@ -196,8 +409,12 @@ class JanEyeReportViewer(GUIStreamPluginBase):
         def save_status():
             new_status = current_status_var.get()
             if self.db_manager.update_report_status(report_id, new_status):
+                self._detail_cache.pop(report_id, None) # Veralteten Cache-Eintrag verwerfen
                 messagebox.showinfo("Success", f"Status for Report ID {report_id} updated to '{new_status}'.")
-                self.refresh_reports() # Tabelle im Hauptfenster aktualisieren
+                # Modell und Tabellenzeile direkt anpassen statt alle Berichte neu zu laden
+                self.report_table.set_value(report_id, "status", new_status)
+                if self.reports_tree.exists(str(report_id)):
+                    self.reports_tree.set(str(report_id), "Status", new_status)
                 detail_window.destroy()
             else:
                 messagebox.showerror("Error", f"Failed to update status for Report ID {report_id}.")
@@ -222,4 +439,4 @@ class JanEyeReportViewer(GUIStreamPluginBase):
         """
         Wird aufgerufen, wenn das Plugin gestoppt oder deaktiviert wird.
         """
-        pass # Keine spezifische Stopp-Logik für dieses einfache Plugin
+        self.close_snapshot(refresh=False)
@@ -0,0 +1,372 @@
+# plugins/network_topology_viewer.py
+
+import tkinter as tk
+from tkinter import ttk
+import math
+import sys
+
+# Fügen Sie das übergeordnete Verzeichnis zum Python-Pfad hinzu,
+# damit db_manager_updated gefunden wird.
+if '..' not in sys.path:
+    sys.path.insert(0, '..')
+
+from plugins.gui_stream_base import GUIStreamPluginBase
+from plugins.topology_model import TopologyModel, LEVEL_HOST, LEVEL_SUBNET, LEVEL_BLOCK, LEVEL_SIZES
+from db_manager_updated import DBManager
+from instrumentation import instrumented_plugin
+
+LEVEL_NAMES = {
+    LEVEL_HOST: "Ziele",
+    LEVEL_SUBNET: "Subnetze",
+    LEVEL_BLOCK: "Blöcke",
+}
+
+# Farbverlauf der Heatmap: wenig Aktivität (dunkles Teal) -> viel Aktivität (Rot)
+HEAT_STOPS = ((0x00, 0x33, 0x33), (0x00, 0xFF, 0xCC), (0xFF, 0xFF, 0x00), (0xFF, 0x33, 0x00))
+HEAT_STEPS = 32
+
+
+def _heat_palette(stops=HEAT_STOPS, steps=HEAT_STEPS):
+    """Erzeugt steps Farben (#RRGGBB) durch lineare Interpolation zwischen den Stützfarben."""
+    palette = []
+    for step in range(steps):
+        position = step / (steps - 1) * (len(stops) - 1)
+        index = min(int(position), len(stops) - 2)
+        fraction = position - index
+        start, end = stops[index], stops[index + 1]
+        palette.append("#%02x%02x%02x" % tuple(round(a + (b - a) * fraction) for a, b in zip(start, end)))
+    return palette
+
+
+class NetworkTopologyViewer(GUIStreamPluginBase):
+    """
+    Topologie-/Heatmap-Ansicht der Scan-Ziele für den "Netzwerk-Scans" Tab.
+
+    Gezeichnet werden nur die Elemente im sichtbaren Ausschnitt und nur auf der
+    Detailstufe, die zum Zoom passt (Blöcke, Subnetze oder einzelne Ziele).
+    Beim Verschieben und Zoomen werden vorhandene Canvas-Elemente verschoben/skaliert
+    und nur neu sichtbare angelegt; beim Aktualisieren werden nur geänderte Knoten neu eingefärbt.
+    """
+    name = "Netzwerk-Scans"
+    type = "network_viewer"
+    stream_type = "network_scan"
+    description = "Skalierbare Topologie-/Heatmap-Ansicht der Netzwerk-Scan-Ziele."
+    author = "Tesseract Core Team"
+    version = "0.1"
+
+    background = "#222222"
+    label_color = "#00FF00"
+    failed_color = "#FF5555"
+    hover_color = "#FFFFFF"
+    zoom_step = 1.25
+    min_scale = 0.02
+    max_scale = 80.0
+    label_min_pixels = 64 # Beschriftungen erst ab dieser Elementgröße
+    load_chunk_size = 10000 # Zeilen pro Event-Loop-Durchlauf beim Einlesen
+
+    def __init__(self, db_manager=None):
+        super().__init__()
+        self.db_manager = db_manager or DBManager()
+        self.model = TopologyModel()
+        self.palette = _heat_palette()
+        self.canvas = None
+        self.status_var = None
+        self.info_var = None
+        self.scale = 1.0 # Pixel pro Welteinheit
+        self.origin_x = 0.0 # Weltkoordinate am linken Canvas-Rand
+        self.origin_y = 0.0
+        self._items = {} # Knotenschlüssel -> Canvas-IDs (Rechteck, ggf. Beschriftung)
+        self._draw_state = None # (Ebene, Beschriftungen an) der gezeichneten Elemente
+        self._heat_reference = None
+        self._drag_start = None
+        self._sync_id = None
+        self._load_id = None
+        self._fit_pending = True
+
+    def create_gui(self, parent):
+        """
+        Erstellt das Tkinter-Frame mit Werkzeugleiste, Canvas und Statuszeile.
+        """
+        frame = super().create_gui(parent)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(1, weight=1)
+
+        toolbar = ttk.Frame(frame, style="TFrame")
+        toolbar.grid(row=0, column=0, sticky="ew", pady=5)
+        toolbar.columnconfigure(3, weight=1)
+        ttk.Button(toolbar, text="Aktualisieren", command=self.reload_topology).grid(row=0, column=0, padx=5)
+        ttk.Button(toolbar, text="Alles anzeigen", command=self.fit_view).grid(row=0, column=1, padx=5)
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(toolbar, textvariable=self.status_var, font=("Consolas", 10)).grid(row=0, column=2, padx=10, sticky="w")
+
+        self.canvas = tk.Canvas(frame, background=self.background, highlightthickness=0)
+        self.canvas.grid(row=1, column=0, sticky="nsew", padx=10)
+        self.canvas.create_rectangle(0, 0, 0, 0, outline=self.hover_color, width=2, state=tk.HIDDEN, tags=("hover",))
+
+        self.info_var = tk.StringVar(value="Mausrad: Zoom | Ziehen: Verschieben | Doppelklick: Hineinzoomen")
+        ttk.Label(frame, textvariable=self.info_var, font=("Consolas", 10)).grid(row=2, column=0, sticky="w", padx=10, pady=5)
+
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self._on_release)
+        self.canvas.bind("<Double-Button-1>", self._on_double_click)
+        self.canvas.bind("<Motion>", self._on_motion)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda event: self.zoom(self.zoom_step, event.x, event.y))
+        self.canvas.bind("<Button-5>", lambda event: self.zoom(1 / self.zoom_step, event.x, event.y))
+        return frame
+
+    # --- Daten ---
+
+    def refresh_topology(self):
+        """
+        Lädt die aggregierten Scan-Ziele und übernimmt sie blockweise ins Modell,
+        damit die Oberfläche auch bei sehr vielen Zielen bedienbar bleibt.
+        """
+        if self._load_id is not None:
+            self.gui_frame.after_cancel(self._load_id)
+            self._load_id = None
+        rows = self.db_manager.get_scan_targets()
+        self._load_chunk(rows, 0)
+
+    def reload_topology(self):
+        """Vom Benutzer ausgelöstes Neuladen: liest die Scan-Ziele am Query-Cache vorbei."""
+        self.db_manager.clear_cache()
+        self.refresh_topology()
+
+    @instrumented_plugin
+    def _load_chunk(self, rows, start):
+        end = start + self.load_chunk_size
+        changed = self.model.update(rows[start:end])
+        self._apply_changes(changed)
+        if end < len(rows):
+            self.status_var.set(f"Lade Ziele... {end}/{len(rows)}")
+            self._load_id = self.gui_frame.after(1, self._load_chunk, rows, end)
+        else:
+            self._load_id = None
+            # Vollständig geladen: Ziele, die nicht mehr in der Datenbank sind, entfernen
+            self._apply_changes(self.model.remove_missing({(row[0], row[1]) for row in rows}))
+            if self._fit_pending:
+                self.fit_view()
+            self._update_status()
+
+    def _apply_changes(self, changed):
+        """
+        Färbt nur geänderte, bereits gezeichnete Knoten neu ein, löscht entfernte
+        und zeichnet neu sichtbare.
+        """
+        level = self._draw_state[0] if self._draw_state else None
+        if level is not None and self.model.heat_reference(level) != self._heat_reference:
+            # Farbskala ist gesprungen: alle gezeichneten Elemente neu einfärben
+            self._heat_reference = self.model.heat_reference(level)
+            changed = self._items.keys()
+        for key in list(changed):
+            items = self._items.get(key)
+            if items is None:
+                continue
+            node = self.model.nodes.get(key)
+            if node is None:
+                self.canvas.delete(*self._items.pop(key))
+            else:
+                self.canvas.itemconfigure(items[0], fill=self._color(node), outline=self._outline(node))
+                if len(items) > 1:
+                    self.canvas.itemconfigure(items[1], text=self._label_text(node))
+        self._schedule_sync()
+
+    # --- Zeichnen ---
+
+    def _color(self, node):
+        reference = self._heat_reference or 1
+        fraction = min(1.0, math.log1p(node.scans + node.reports) / math.log1p(reference))
+        return self.palette[round(fraction * (HEAT_STEPS - 1))]
+
+    def _outline(self, node):
+        # Fehlgeschlagene Scans rot umranden; sonst Hintergrundfarbe als Trennlinie
+        return self.failed_color if node.failed else self.background
+
+    @staticmethod
+    def _label_text(node):
+        if node.level == LEVEL_HOST:
+            return node.label
+        return f"{node.label}\n{node.children} Ziele"
+
+    def _viewport(self):
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        return (self.origin_x, self.origin_y,
+                self.origin_x + width / self.scale, self.origin_y + height / self.scale)
+
+    def _schedule_sync(self):
+        # Mehrere Ereignisse (Ziehen, Zoomen, Ladeblöcke) zu einem Abgleich zusammenfassen
+        if self._sync_id is None and self.canvas is not None:
+            self._sync_id = self.canvas.after_idle(self._sync_visible)
+
+    def _sync_visible(self):
+        """
+        Gleicht die Canvas-Elemente mit dem sichtbaren Ausschnitt ab: nicht mehr sichtbare
+        werden gelöscht, neu sichtbare angelegt. Nur beim Wechsel der Detailstufe wird
+        der Ausschnitt komplett neu gezeichnet.
+        """
+        self._sync_id = None
+        level = self.model.level_for_scale(self.scale)
+        state = (level, LEVEL_SIZES[level] * self.scale >= self.label_min_pixels)
+        if state != self._draw_state:
+            self.canvas.delete("node")
+            self._items.clear()
+            self._draw_state = state
+        self._heat_reference = self.model.heat_reference(level)
+
+        visible = self.model.visible(level, *self._viewport())
+        stale = [key for key in self._items if key not in visible]
+        if stale:
+            self.canvas.delete(*[item for key in stale for item in self._items.pop(key)])
+        for key in visible:
+            if key not in self._items:
+                self._items[key] = self._draw_node(self.model.nodes[key], state[1])
+        self.canvas.tag_raise("hover")
+        self._update_status()
+
+    def _draw_node(self, node, with_label):
+        x0 = (node.x - self.origin_x) * self.scale
+        y0 = (node.y - self.origin_y) * self.scale
+        size = node.size * self.scale
+        items = (self.canvas.create_rectangle(x0, y0, x0 + size, y0 + size, fill=self._color(node),
+                                              outline=self._outline(node), tags=("node",)),)
+        if with_label:
+            items += (self.canvas.create_text(x0 + 4, y0 + 4, text=self._label_text(node), anchor=tk.NW,
+                                              fill=self.label_color, font=("Consolas", 9), tags=("node",)),)
+        return items
+
+    def _update_status(self):
+        if self.status_var is None or self._load_id is not None:
+            return
+        level = self._draw_state[0] if self._draw_state else LEVEL_BLOCK
+        self.status_var.set(f"Ziele: {len(self.model)} | Ebene: {LEVEL_NAMES[level]} | "
+                            f"Gezeichnet: {len(self._items)} | Zoom: {self.scale:.3g}")
+
+    # --- Navigation ---
+
+    def pan(self, dx, dy):
+        """Verschiebt die Ansicht um dx/dy Pixel; vorhandene Elemente werden nur verschoben."""
+        self.origin_x -= dx / self.scale
+        self.origin_y -= dy / self.scale
+        self.canvas.move("node", dx, dy)
+        self.canvas.move("hover", dx, dy)
+        self._schedule_sync()
+
+    def zoom(self, factor, x, y):
+        """Zoomt um factor um den Canvas-Punkt (x, y)."""
+        new_scale = min(self.max_scale, max(self.min_scale, self.scale * factor))
+        factor = new_scale / self.scale
+        if factor == 1.0:
+            return
+        # Weltpunkt unter dem Mauszeiger bleibt an derselben Stelle
+        world_x = self.origin_x + x / self.scale
+        world_y = self.origin_y + y / self.scale
+        self.scale = new_scale
+        self.origin_x = world_x - x / self.scale
+        self.origin_y = world_y - y / self.scale
+        self.canvas.scale("node", x, y, factor, factor)
+        self.canvas.itemconfigure("hover", state=tk.HIDDEN)
+        self._schedule_sync()
+
+    def zoom_to(self, x0, y0, x1, y1, margin=0.05):
+        """Zeigt das Weltrechteck (x0, y0)-(x1, y1) möglichst groß und zentriert an."""
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        span_x = max(x1 - x0, 1e-9) * (1 + 2 * margin)
+        span_y = max(y1 - y0, 1e-9) * (1 + 2 * margin)
+        self.scale = min(self.max_scale, max(self.min_scale, min(width / span_x, height / span_y)))
+        self.origin_x = (x0 + x1) / 2 - width / self.scale / 2
+        self.origin_y = (y0 + y1) / 2 - height / self.scale / 2
+        # Alle Positionen ändern sich: Ausschnitt neu zeichnen
+        self._draw_state = None
+        self.canvas.itemconfigure("hover", state=tk.HIDDEN)
+        self._schedule_sync()
+
+    def fit_view(self):
+        """Zeigt alle Blöcke an."""
+        if self.canvas.winfo_width() <= 1:
+            # Canvas noch nicht sichtbar; beim ersten <Configure> nachholen
+            self._fit_pending = True
+            return
+        self._fit_pending = False
+        self.zoom_to(*self.model.bounds())
+
+    def _on_configure(self, event):
+        if self._fit_pending and self.model.nodes:
+            self.fit_view()
+        else:
+            self._schedule_sync()
+
+    def _on_press(self, event):
+        self._drag_start = (event.x, event.y)
+
+    def _on_drag(self, event):
+        if self._drag_start is None:
+            return
+        dx, dy = event.x - self._drag_start[0], event.y - self._drag_start[1]
+        self._drag_start = (event.x, event.y)
+        self.pan(dx, dy)
+
+    def _on_release(self, event):
+        self._drag_start = None
+
+    def _on_mousewheel(self, event):
+        self.zoom(self.zoom_step if event.delta > 0 else 1 / self.zoom_step, event.x, event.y)
+
+    def _node_at(self, x, y):
+        """Hit-Test über den Rasterindex der aktuell gezeichneten Ebene."""
+        if self._draw_state is None:
+            return None
+        return self.model.hit_test(self._draw_state[0], self.origin_x + x / self.scale, self.origin_y + y / self.scale)
+
+    def _on_motion(self, event):
+        node = self._node_at(event.x, event.y)
+        if node is None:
+            self.canvas.itemconfigure("hover", state=tk.HIDDEN)
+            return
+        x0 = (node.x - self.origin_x) * self.scale
+        y0 = (node.y - self.origin_y) * self.scale
+        size = node.size * self.scale
+        self.canvas.coords("hover", x0, y0, x0 + size, y0 + size)
+        self.canvas.itemconfigure("hover", state=tk.NORMAL)
+        self.canvas.tag_raise("hover")
+        last_seen = node.last_seen.strftime("%Y-%m-%d %H:%M") if node.last_seen else "-"
+        targets = "" if node.level == LEVEL_HOST else f"{node.children} Ziele | "
+        self.info_var.set(f"{node.label} | {targets}Scans: {node.scans} (fehlgeschlagen: {node.failed}) | "
+                          f"Berichte: {node.reports} | Zuletzt: {last_seen}")
+
+    def _on_double_click(self, event):
+        node = self._node_at(event.x, event.y)
+        if node is not None:
+            self.zoom_to(node.x, node.y, node.x + node.size, node.y + node.size)
+
+    # --- Plugin-Lebenszyklus ---
+
+    @instrumented_plugin
+    def update_gui(self):
+        """
+        Übernimmt neue oder geänderte Scan-Ziele (inkrementell).
+        """
+        self.refresh_topology()
+
+    def run(self, **kwargs):
+        """
+        Lädt die Topologie initial.
+        """
+        super().run(**kwargs)
+        self.refresh_topology()
+
+    def stop(self):
+        """
+        Bricht laufende Ladevorgänge und geplante Abgleiche ab.
+        """
+        super().stop()
+        if self._load_id is not None:
+            self.gui_frame.after_cancel(self._load_id)
+            self._load_id = None
+        if self._sync_id is not None:
+            self.canvas.after_cancel(self._sync_id)
+            self._sync_id = None
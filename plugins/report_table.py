@@ -0,0 +1,300 @@
+# plugins/report_table.py
+
+# Kompaktes, spaltenorientiertes In-Memory-Modell der Berichtsliste.
+# Statt einer ORM-Instanz pro Bericht hält ReportTable parallele Arrays:
+# Integer-IDs, kodierte Kategorien (severity, status, issue_type) und
+# internierte Texte. Filter, mehrstufige Sortierung und Gruppierungen laufen
+# über Zeilenindizes, ohne die Datenbank erneut abzufragen.
+
+import array
+import collections
+import datetime
+import sys
+
+# Fachliche Reihenfolge statt alphabetischer Sortierung
+SEVERITY_ORDER = ("Critical", "High", "Medium", "Low", "Informational")
+STATUS_ORDER = ("New", "Triaged", "FalsePositive", "Fixed", "Ignored")
+
+CODED_COLUMNS = ("severity", "status", "issue_type")
+TEXT_COLUMNS = ("file_path", "description_preview", "snippet_preview")
+
+# Zeitstempel werden als Sekunden seit 1970-01-01 (naiv, ohne Zeitzone) gespeichert
+EPOCH = datetime.datetime(1970, 1, 1)
+_ONE_SECOND = datetime.timedelta(seconds=1)
+MISSING_DATE = float("-inf")  # sortiert fehlende Zeitstempel nach vorne
+_MISSING_LINE = -1
+
+
+class _Dictionary:
+    """Wörterbuch-Kodierung einer Kategorie-Spalte (Wert <-> Code) mit Sortierrang."""
+    def __init__(self, values=(), order=()):
+        self.values = []
+        self.codes = {}
+        self._order = {value: rank for rank, value in enumerate(order)}
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def ranks(self):
+        """Sortierrang je Code: bekannte Werte in fachlicher Reihenfolge, danach alphabetisch."""
+        known = len(self._order)
+        ordered = sorted(range(len(self.values)), key=lambda code: (
+            self._order.get(self.values[code], known), str(self.values[code])))
+        ranks = [0] * len(self.values)
+        for rank, code in enumerate(ordered):
+            ranks[code] = rank
+        return ranks
+
+
+class ReportTable:
+    """
+    Spaltenorientierte Tabelle der Berichtsübersicht.
+    Alle Abfragen arbeiten auf Listen von Zeilenindizes (0..len-1).
+    """
+    def __init__(self):
+        self.ids = array.array("q")
+        self.line_numbers = array.array("i")
+        self.analysis_dates = array.array("d")
+        self.coded = {name: array.array("H") for name in CODED_COLUMNS}
+        self.dictionaries = {
+            "severity": _Dictionary(order=SEVERITY_ORDER),
+            "status": _Dictionary(order=STATUS_ORDER),
+            "issue_type": _Dictionary(),
+        }
+        self.texts = {name: [] for name in TEXT_COLUMNS}
+        self._snapshot = None # Bei Snapshot-Quelle werden Texte erst beim Zugriff dekodiert
+        self._index_by_id = None
+        self._search_keys = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_summaries(cls, rows):
+        """
+        Baut die Tabelle aus DBManager.get_code_analysis_report_summaries()-Zeilen
+        (Spaltenreihenfolge wie dort dokumentiert).
+        """
+        table = cls()
+        intern = sys.intern
+        severities, statuses, issue_types = (table.coded[name] for name in ("severity", "status", "issue_type"))
+        encode_severity, encode_status, encode_issue_type = (
+            table.dictionaries[name].encode for name in ("severity", "status", "issue_type"))
+        file_paths, descriptions, snippets = (table.texts[name] for name in TEXT_COLUMNS)
+        for (report_id, file_path, issue_type, severity, description_preview,
+             line_number, snippet_preview, analysis_date, status) in rows:
+            table.ids.append(report_id)
+            table.line_numbers.append(_MISSING_LINE if line_number is None else line_number)
+            table.analysis_dates.append((analysis_date - EPOCH) / _ONE_SECOND if analysis_date else MISSING_DATE)
+            severities.append(encode_severity(severity))
+            statuses.append(encode_status(status))
+            issue_types.append(encode_issue_type(issue_type))
+            # Dateipfade wiederholen sich häufig; internierte Strings teilen sich den Speicher
+            file_paths.append(intern(file_path or ""))
+            descriptions.append(description_preview or "")
+            snippets.append(snippet_preview or "")
+        return table
+
+    @classmethod
+    def from_snapshot(cls, snapshot, preview_length):
+        """
+        Baut die Tabelle aus einem ReportSnapshot. Die festen Spalten werden direkt
+        aus dem mmap kopiert; Texte bleiben im Snapshot und werden bei Bedarf gelesen.
+        """
+        table = cls()
+        table._snapshot = (snapshot, preview_length)
+        table.ids = array.array("q", snapshot.columns["id"])
+        table.line_numbers = array.array("i", snapshot.columns["line_number"])
+        table.analysis_dates = array.array("d", (
+            MISSING_DATE if value != value else value for value in snapshot.columns["analysis_date"]))
+        for name in CODED_COLUMNS:
+            table.dictionaries[name] = _Dictionary(snapshot.dictionaries[name], table.dictionaries[name]._order)
+            table.coded[name] = array.array("H", snapshot.columns[name])
+        return table
+
+    # --- Zugriff ---
+
+    def text(self, name, index):
+        """Gibt einen Text der Zeile index zurück (Vorschau bei description/snippet)."""
+        texts = self.texts[name]
+        if self._snapshot is None or index < len(texts):
+            return texts[index]
+        snapshot, preview_length = self._snapshot
+        if name == "file_path":
+            return snapshot.text("file_path", index)
+        field = "description" if name == "description_preview" else "code_snippet"
+        return snapshot.preview(field, index, preview_length)
+
+    def _decode_texts(self, name, stop):
+        """
+        Dekodiert eine Text-Spalte aus dem Snapshot bis Zeile stop (ausschließlich).
+        Bereits dekodierte Zeilen bleiben erhalten; Dateipfade werden wie in
+        from_summaries interniert.
+        """
+        texts = self.texts[name]
+        start = len(texts)
+        if self._snapshot is None or start >= stop:
+            return
+        snapshot, preview_length = self._snapshot
+        if name == "file_path":
+            texts.extend(map(sys.intern, snapshot.texts("file_path", start=start, stop=stop)))
+        else:
+            field = "description" if name == "description_preview" else "code_snippet"
+            texts.extend(snapshot.previews(field, preview_length, start, stop))
+
+    def _text_column(self, name):
+        """Gibt eine Text-Spalte als vollständige Liste zurück (bei Snapshot-Quelle einmalig dekodiert)."""
+        self._decode_texts(name, len(self))
+        return self.texts[name]
+
+    def decode_steps(self, chunk_size=5000):
+        """
+        Generator, der bei Snapshot-Quelle Text-Spalten und Suchschlüssel schrittweise
+        (chunk_size Zeilen je Schritt) vorbereitet, z.B. per after() im Leerlauf der GUI.
+        Danach sortieren und filtern Text-Spalten ohne erneutes Dekodieren.
+        """
+        if self._snapshot is None:
+            return
+        for stop in range(chunk_size, len(self) + chunk_size, chunk_size):
+            stop = min(stop, len(self))
+            for name in TEXT_COLUMNS:
+                self._decode_texts(name, stop)
+            self._extend_search_keys(stop)
+            yield
+
+    def value(self, name, index):
+        """Gibt den dekodierten Wert einer Spalte für eine Zeile zurück."""
+        if name in CODED_COLUMNS:
+            return self.dictionaries[name].values[self.coded[name][index]]
+        if name in TEXT_COLUMNS:
+            return self.text(name, index)
+        if name == "id":
+            return self.ids[index]
+        if name == "line_number":
+            line_number = self.line_numbers[index]
+            return None if line_number == _MISSING_LINE else line_number
+        if name == "analysis_date":
+            seconds = self.analysis_dates[index]
+            return None if seconds == MISSING_DATE else EPOCH + datetime.timedelta(seconds=seconds)
+        raise KeyError(name)
+
+    def index_of(self, report_id):
+        """Zeilenindex zu einer Bericht-ID (oder None)."""
+        if self._index_by_id is None:
+            self._index_by_id = {report_id: index for index, report_id in enumerate(self.ids)}
+        return self._index_by_id.get(report_id)
+
+    def set_value(self, report_id, name, value):
+        """Ändert eine Kategorie-Spalte einer Zeile (z.B. nach einem Status-Update) ohne Neuladen."""
+        index = self.index_of(report_id)
+        if index is None:
+            return False
+        self.coded[name][index] = self.dictionaries[name].encode(value)
+        return True
+
+    # --- Abfragen ---
+
+    def filter(self, indices=None, text=None, **equals):
+        """
+        Gibt die Zeilenindizes zurück, die allen Bedingungen genügen.
+
+        Args:
+            indices: Ausgangsmenge (Standard: alle Zeilen).
+            text: Teilstring (ohne Groß-/Kleinschreibung) in Dateipfad, Issue-Typ oder Beschreibung.
+            **equals: Kategorie-Spalte -> Wert oder Menge erlaubter Werte, z.B. severity={"Critical", "High"}.
+        """
+        if indices is None:
+            indices = range(len(self))
+        for name, wanted in equals.items():
+            if wanted is None:
+                continue
+            if isinstance(wanted, str) or not isinstance(wanted, (set, frozenset, list, tuple)):
+                wanted = (wanted,)
+            dictionary = self.dictionaries[name]
+            allowed = {dictionary.codes[value] for value in wanted if value in dictionary.codes}
+            codes = self.coded[name]
+            if len(allowed) == 1:
+                code = allowed.pop()
+                indices = [index for index in indices if codes[index] == code]
+            else:
+                indices = [index for index in indices if codes[index] in allowed]
+        if text:
+            needle = text.lower()
+            keys = self._get_search_keys()
+            indices = [index for index in indices if needle in keys[index]]
+        return list(indices)
+
+    def _get_search_keys(self):
+        self._extend_search_keys(len(self))
+        return self._search_keys
+
+    def _extend_search_keys(self, stop):
+        """Ergänzt die Suchschlüssel (Dateipfad, Issue-Typ, Beschreibung in Kleinbuchstaben) bis Zeile stop."""
+        if self._search_keys is None:
+            self._search_keys = []
+        start = len(self._search_keys)
+        if start >= stop:
+            return
+        self._decode_texts("file_path", stop)
+        self._decode_texts("description_preview", stop)
+        issue_types = [value.lower() if value else "" for value in self.dictionaries["issue_type"].values]
+        codes = self.coded["issue_type"]
+        file_paths = self.texts["file_path"]
+        descriptions = self.texts["description_preview"]
+        self._search_keys.extend(
+            f"{file_paths[index]}\0{issue_types[codes[index]]}\0{descriptions[index]}".lower()
+            for index in range(start, stop))
+
+    def sort(self, indices, keys):
+        """
+        Sortiert Zeilenindizes stabil nach mehreren Schlüsseln.
+
+        Args:
+            indices: Zu sortierende Zeilenindizes.
+            keys: Liste von (Spaltenname, absteigend); der erste Schlüssel hat Vorrang.
+        """
+        indices = list(indices)
+        # Stabile Sortierung: vom letzten zum ersten Schlüssel sortieren
+        for name, descending in reversed(keys):
+            if name in CODED_COLUMNS:
+                indices = self._bucket_sort(indices, name, descending)
+            else:
+                if name in TEXT_COLUMNS:
+                    key = self._text_sort_key(name)
+                elif name == "id":
+                    key = self.ids.__getitem__
+                elif name == "line_number":
+                    key = self.line_numbers.__getitem__
+                else:
+                    key = self.analysis_dates.__getitem__
+                indices.sort(key=key, reverse=descending)
+        return indices
+
+    def _text_sort_key(self, name):
+        return self._text_column(name).__getitem__
+
+    def _bucket_sort(self, indices, name, descending):
+        """Stabile Sortierung einer Kategorie-Spalte in O(n) über ihre wenigen Codes."""
+        codes = self.coded[name]
+        dictionary = self.dictionaries[name]
+        buckets = [[] for _ in dictionary.values]
+        for index in indices:
+            buckets[codes[index]].append(index)
+        ranks = dictionary.ranks()
+        order = sorted(range(len(buckets)), key=ranks.__getitem__, reverse=descending)
+        return [index for code in order for index in buckets[code]]
+
+    def group_counts(self, name, indices=None):
+        """Zählt Zeilen je Wert einer Kategorie-Spalte (in fachlicher Reihenfolge)."""
+        codes = self.coded[name]
+        counts = collections.Counter(codes if indices is None else map(codes.__getitem__, indices))
+        dictionary = self.dictionaries[name]
+        ranks = dictionary.ranks()
+        return {dictionary.values[code]: counts[code]
+                for code in sorted(counts, key=ranks.__getitem__)}
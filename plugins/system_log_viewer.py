@@ -0,0 +1,199 @@
+# plugins/system_log_viewer.py
+
+import tkinter as tk
+from tkinter import ttk
+from tkinter import filedialog, messagebox
+import datetime
+import time
+import sys
+
+# Fügen Sie das übergeordnete Verzeichnis zum Python-Pfad hinzu,
+# damit instrumentation gefunden wird.
+if '..' not in sys.path:
+    sys.path.insert(0, '..')
+
+from plugins.gui_stream_base import GUIStreamPluginBase
+from instrumentation import get_instrumentation, instrumented_plugin, KIND_EVENT_LOOP
+
+
+class EventLoopLagSampler:
+    """
+    Misst die Verzögerung der Tk-Event-Loop: plant regelmäßig einen after()-Callback
+    ein und vergleicht den tatsächlichen mit dem erwarteten Ausführungszeitpunkt.
+    Nur Verzögerungen ab lag_threshold_ms landen im Ringpuffer.
+    """
+    def __init__(self, root, instrumentation, interval_ms=200, lag_threshold_ms=20.0):
+        self.root = root
+        self.instrumentation = instrumentation
+        self.interval_ms = interval_ms
+        self.lag_threshold_ms = lag_threshold_ms
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self._expected = None
+        self._after_id = None
+
+    def start(self):
+        if self._after_id is None:
+            self._schedule()
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self):
+        self._expected = time.perf_counter() + self.interval_ms / 1000.0
+        self._after_id = self.root.after(self.interval_ms, self._sample)
+
+    def _sample(self):
+        lag_ms = max(0.0, (time.perf_counter() - self._expected) * 1000.0)
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        if lag_ms >= self.lag_threshold_ms:
+            self.instrumentation.record(KIND_EVENT_LOOP, "tk.after_lag", lag_ms, interval_ms=self.interval_ms)
+        self._schedule()
+
+
+class SystemLogViewer(GUIStreamPluginBase):
+    """
+    Zeigt die Messereignisse der Instrumentierung (SQL-Statements, DBManager-Methoden,
+    Event-Loop-Verzögerungen, Plugin-Updates) live im System-Log Tab an.
+    """
+    name = "System-Log"
+    type = "monitor"
+    stream_type = "system_log"
+    description = "Live-Ansicht der Query-Instrumentierung und des Slow-Query-Logs."
+    author = "Tesseract Core Team"
+    version = "0.1"
+
+    columns = ("Zeit", "Art", "Dauer (ms)", "Zeilen", "Methode", "Name")
+    max_rows = 1000 # Maximale Anzahl angezeigter Zeilen
+    poll_interval_ms = 1000
+
+    def __init__(self, instrumentation=None):
+        super().__init__()
+        self.instrumentation = instrumentation or get_instrumentation()
+        self.log_tree = None
+        self.lag_sampler = None
+        self.status_var = None
+        self.slow_only_var = None
+        self._last_seq = 0
+        self._poll_id = None
+
+    def create_gui(self, parent):
+        """
+        Erstellt das Tkinter-Frame für das System-Log.
+        """
+        frame = super().create_gui(parent)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(1, weight=1)
+
+        toolbar = ttk.Frame(frame, style="TFrame")
+        toolbar.grid(row=0, column=0, columnspan=2, sticky="ew", pady=5)
+        toolbar.columnconfigure(0, weight=1)
+
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(toolbar, textvariable=self.status_var, font=("Consolas", 10)).grid(row=0, column=0, sticky="w", padx=10)
+
+        self.slow_only_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(toolbar, text=f"Nur langsame (>= {self.instrumentation.slow_threshold_ms:g} ms)",
+                        variable=self.slow_only_var, command=self.reload).grid(row=0, column=1, padx=5)
+        ttk.Button(toolbar, text="Leeren", command=self.clear).grid(row=0, column=2, padx=5)
+        ttk.Button(toolbar, text="Exportieren...", command=self.export).grid(row=0, column=3, padx=5)
+
+        self.log_tree = ttk.Treeview(frame, columns=self.columns, show="headings", style="Treeview")
+        for col in self.columns:
+            self.log_tree.heading(col, text=col, anchor=tk.W)
+            self.log_tree.column(col, width=100, stretch=True)
+        self.log_tree.column("Zeit", width=100, minwidth=90, stretch=False)
+        self.log_tree.column("Art", width=90, minwidth=70, stretch=False)
+        self.log_tree.column("Dauer (ms)", width=90, minwidth=70, stretch=False, anchor=tk.E)
+        self.log_tree.column("Zeilen", width=70, minwidth=50, stretch=False, anchor=tk.E)
+        self.log_tree.column("Methode", width=180, minwidth=100)
+        self.log_tree.column("Name", width=500, minwidth=200)
+        self.log_tree.tag_configure("slow", foreground="#FF5555")
+        self.log_tree.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
+
+        vsb = ttk.Scrollbar(frame, orient="vertical", command=self.log_tree.yview)
+        vsb.grid(row=1, column=1, sticky="ns")
+        self.log_tree.configure(yscrollcommand=vsb.set)
+
+        self.lag_sampler = EventLoopLagSampler(frame.winfo_toplevel(), self.instrumentation)
+        return frame
+
+    def _insert_event(self, entry):
+        timestamp = datetime.datetime.fromtimestamp(entry["time"]).strftime("%H:%M:%S.%f")[:-3]
+        rows = entry.get("rows")
+        self.log_tree.insert("", "end", values=(
+            timestamp,
+            entry["kind"],
+            f"{entry['duration_ms']:.2f}",
+            "" if rows is None else rows,
+            entry.get("method") or "",
+            f"{entry['name']}  [FEHLER: {entry['error']}]" if entry.get("error") else entry["name"],
+        ), tags=("slow",) if entry["slow"] or entry.get("error") else ())
+
+    @instrumented_plugin(min_duration_ms=10.0)
+    def update_gui(self):
+        """
+        Übernimmt neue Ereignisse aus dem Ringpuffer in die Tabelle.
+        """
+        new_events = self.instrumentation.events(since_seq=self._last_seq, slow_only=self.slow_only_var.get())
+        for entry in new_events:
+            self._insert_event(entry)
+        if new_events:
+            self._last_seq = new_events[-1]["seq"]
+            # Älteste Zeilen entfernen, damit die Tabelle nicht unbegrenzt wächst
+            children = self.log_tree.get_children()
+            if len(children) > self.max_rows:
+                self.log_tree.delete(*children[:len(children) - self.max_rows])
+            self.log_tree.see(self.log_tree.get_children()[-1])
+        self.status_var.set(
+            f"Ereignisse: {len(self.log_tree.get_children())} | "
+            f"Event-Loop-Lag: {self.lag_sampler.last_lag_ms:.1f} ms (max {self.lag_sampler.max_lag_ms:.1f} ms)")
+
+    def reload(self):
+        """Baut die Tabelle neu auf (z.B. nach Änderung des Filters)."""
+        self.log_tree.delete(*self.log_tree.get_children())
+        self._last_seq = 0
+        self.update_gui()
+
+    def clear(self):
+        """Leert Ringpuffer und Tabelle."""
+        self.instrumentation.clear()
+        self.reload()
+
+    def export(self):
+        """Schreibt den Ringpuffer als JSON Lines in eine vom Benutzer gewählte Datei."""
+        path = filedialog.asksaveasfilename(parent=self.gui_frame, defaultextension=".jsonl",
+                                            filetypes=[("JSON Lines", "*.jsonl"), ("Alle Dateien", "*.*")])
+        if not path:
+            return
+        try:
+            count = self.instrumentation.dump(path)
+            messagebox.showinfo("Export", f"{count} Ereignisse nach '{path}' geschrieben.")
+        except OSError as e:
+            messagebox.showerror("Error", f"Export fehlgeschlagen: {e}")
+
+    def _poll(self):
+        self.update_gui()
+        self._poll_id = self.gui_frame.after(self.poll_interval_ms, self._poll)
+
+    def run(self, **kwargs):
+        """
+        Startet die Event-Loop-Messung und das periodische Aktualisieren der Tabelle.
+        """
+        super().run(**kwargs)
+        self.lag_sampler.start()
+        if self._poll_id is None:
+            self._poll()
+
+    def stop(self):
+        """
+        Beendet Event-Loop-Messung und Aktualisierung.
+        """
+        super().stop()
+        self.lag_sampler.stop()
+        if self._poll_id is not None:
+            self.gui_frame.after_cancel(self._poll_id)
+            self._poll_id = None
@@ -0,0 +1,469 @@
+# plugins/topology_model.py
+
+# Datenmodell der Netzwerk-Topologie/Heatmap für den "Netzwerk-Scans" Tab (ohne Tk).
+#
+# Ziele aus der Scan-Tabelle werden hierarchisch in Weltkoordinaten angeordnet:
+#   Block  (LEVEL_BLOCK)   IPv4-/16, IPv6-/48 oder Gruppe (MAC-Adressen, Hosts, SSIDs)
+#   Subnetz (LEVEL_SUBNET) IPv4-/24, IPv6-/64, MAC-Hersteller-Präfix (OUI), Domain
+#   Ziel   (LEVEL_HOST)    einzelne IP, MAC, Hostname oder SSID
+# Ein Block ist ein 16x16-Raster aus Subnetzen, ein Subnetz ein 16x16-Raster aus Zielen.
+# Bei IPv4 entspricht die Rasterposition dem Oktett, damit das Layout stabil bleibt,
+# wenn neue Scans hinzukommen. Jede Ebene hat einen eigenen Rasterindex für Hit-Tests
+# und Sichtbarkeitsabfragen.
+
+import collections
+import heapq
+import ipaddress
+import math
+import re
+import socket
+
+LEVEL_HOST = 0
+LEVEL_SUBNET = 1
+LEVEL_BLOCK = 2
+
+GRID = 16                           # Zellen pro Rasterzeile (Subnetze im Block, Ziele im Subnetz)
+HOST_SIZE = 1.0                     # Weltkoordinaten-Einheiten pro Ziel
+SUBNET_SIZE = GRID * HOST_SIZE
+BLOCK_SIZE = GRID * SUBNET_SIZE
+BLOCK_PITCH = BLOCK_SIZE * 1.125    # Blockgröße inklusive Abstand
+BLOCKS_PER_ROW = 8
+LEVEL_SIZES = {LEVEL_HOST: HOST_SIZE, LEVEL_SUBNET: SUBNET_SIZE, LEVEL_BLOCK: BLOCK_SIZE}
+
+# Mindestgröße eines Elements in Pixeln, ab der die jeweils feinere Ebene gezeichnet wird
+MIN_HOST_PIXELS = 10.0
+MIN_SUBNET_PIXELS = 6.0
+
+_MAC_PATTERN = re.compile(r"^([0-9a-f]{2})[:-]([0-9a-f]{2})[:-]([0-9a-f]{2})([:-][0-9a-f]{2}){3}$", re.IGNORECASE)
+
+
+def classify_target(target, scan_type=None):
+    """
+    Ordnet ein Scan-Ziel seiner Block- und Subnetz-Gruppe zu.
+
+    Returns:
+        (block_key, subnet_key, slot_hint); slot_hint ist (Subnetz-Slot, Ziel-Slot)
+        für IPv4, sonst None (Slots werden dann in Reihenfolge vergeben).
+    """
+    try:
+        # Schneller Pfad für IPv4 (der häufigste Fall) ohne ipaddress-Objekte
+        octets = socket.inet_pton(socket.AF_INET, target)
+    except (OSError, ValueError):
+        octets = None
+    if octets is not None:
+        block = f"{octets[0]}.{octets[1]}.0.0/16"
+        subnet = f"{octets[0]}.{octets[1]}.{octets[2]}.0/24"
+        return block, subnet, (octets[2], octets[3])
+    if ":" in target and not _MAC_PATTERN.match(target):
+        try:
+            address = ipaddress.IPv6Address(target)
+        except ValueError:
+            address = None
+        if address is not None:
+            block = str(ipaddress.ip_network(f"{address}/48", strict=False))
+            subnet = str(ipaddress.ip_network(f"{address}/64", strict=False))
+            return block, subnet, None
+
+    match = _MAC_PATTERN.match(target)
+    if match:
+        if int(match.group(1), 16) & 0x02:
+            # Lokal verwaltete (z.B. zufällige Privacy-)Adressen haben keinen aussagekräftigen Hersteller
+            return "MAC", "lokal verwaltet", None
+        oui = ":".join(match.group(i) for i in range(1, 4)).lower()
+        return "MAC", f"OUI {oui}", None
+    if scan_type == "wifi":
+        return "WiFi/SSID", "SSID", None
+    labels = target.lower().rstrip(".").split(".")
+    domain = ".".join(labels[-2:]) if len(labels) >= 2 else "(lokal)"
+    return "Hosts", domain, None
+
+
+class TopologyNode:
+    """Ein Element der Topologie (Ziel, Subnetz oder Block) mit aggregierten Messwerten."""
+    __slots__ = ("key", "level", "label", "parent", "x", "y", "size",
+                 "scans", "failed", "reports", "children", "last_seen")
+
+    def __init__(self, key, level, label, parent, x, y, size):
+        self.key = key
+        self.level = level
+        self.label = label
+        self.parent = parent # Schlüssel des übergeordneten Knotens (oder None)
+        self.x = x
+        self.y = y
+        self.size = size
+        self.scans = 0
+        self.failed = 0
+        self.reports = 0
+        self.children = 0 # Anzahl der Ziele unterhalb dieses Knotens
+        self.last_seen = None
+
+    @property
+    def weight(self):
+        """Größe, aus der die Heatmap-Farbe berechnet wird."""
+        return self.scans + self.reports
+
+    def __repr__(self):
+        return f"<TopologyNode(key='{self.key}', level={self.level}, scans={self.scans}, reports={self.reports})>"
+
+
+class GridIndex:
+    """
+    Räumlicher Index über ein gleichmäßiges Raster: jede Zelle kennt die Schlüssel
+    der Elemente, die sie überlappen. Punkt- und Rechteckabfragen prüfen nur die
+    betroffenen Zellen statt aller Elemente.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self._cells = collections.defaultdict(list)
+
+    def _cell_range(self, x0, y0, x1, y1):
+        size = self.cell_size
+        return (range(int(math.floor(x0 / size)), int(math.floor(x1 / size)) + 1),
+                range(int(math.floor(y0 / size)), int(math.floor(y1 / size)) + 1))
+
+    def insert(self, key, x, y, size):
+        cell_size = self.cell_size
+        if size <= cell_size:
+            cx, cy = int(x // cell_size), int(y // cell_size)
+            if (x + size) <= (cx + 1) * cell_size and (y + size) <= (cy + 1) * cell_size:
+                # Häufigster Fall: das Element liegt vollständig in einer Zelle
+                self._cells[(cx, cy)].append(key)
+                return
+        # Elemente liegen an Rasterkanten; minimal verkleinert, damit sie keine Nachbarzelle belegen
+        columns, rows = self._cell_range(x, y, x + size * 0.999, y + size * 0.999)
+        for cx in columns:
+            for cy in rows:
+                self._cells[(cx, cy)].append(key)
+
+    def remove(self, key, x, y, size):
+        columns, rows = self._cell_range(x, y, x + size * 0.999, y + size * 0.999)
+        for cx in columns:
+            for cy in rows:
+                keys = self._cells.get((cx, cy))
+                if keys is not None and key in keys:
+                    keys.remove(key)
+                    if not keys:
+                        del self._cells[(cx, cy)]
+
+    def query_point(self, x, y):
+        size = self.cell_size
+        return self._cells.get((int(math.floor(x / size)), int(math.floor(y / size))), ())
+
+    def query_rect(self, x0, y0, x1, y1):
+        """Gibt die Schlüssel aller Elemente in den Zellen des Rechtecks zurück (ohne Duplikate)."""
+        columns, rows = self._cell_range(x0, y0, x1, y1)
+        seen = set()
+        cells = self._cells
+        for cx in columns:
+            for cy in rows:
+                keys = cells.get((cx, cy))
+                if keys:
+                    seen.update(keys)
+        return seen
+
+
+class TopologyModel:
+    """
+    Hält alle Knoten der drei Ebenen samt Layout und Rasterindizes.
+    update() übernimmt neue Zielstatistiken, remove_missing() entfernt nicht mehr vorhandene;
+    beide melden, welche Knoten sich geändert haben, damit die Ansicht nur diese neu zeichnen muss.
+    """
+    def __init__(self):
+        self.nodes = {}
+        self.indexes = {
+            LEVEL_HOST: GridIndex(SUBNET_SIZE),
+            LEVEL_SUBNET: GridIndex(BLOCK_SIZE / 4),
+            LEVEL_BLOCK: GridIndex(BLOCK_PITCH),
+        }
+        self._block_order = [] # Blockschlüssel je Layout-Position (None = frei gewordene Position)
+        self._next_subnet_slot = collections.Counter() # Block -> nächster noch nie vergebener Subnetz-Slot
+        self._next_host_slot = collections.Counter()   # Subnetz -> nächster noch nie vergebener Ziel-Slot
+        self._free_slots = collections.defaultdict(list) # Block/Subnetz -> Heap frei gewordener Slots
+        self._slots = {} # Knotenschlüssel -> (Gruppe, Slot) für in Reihenfolge vergebene Slots
+        self._overflow = {} # Block -> Fortsetzungsblock, sobald er mehr als 256 Subnetze hätte
+        self._targets = {} # (target, scan_type) -> (scans, failed, reports, last_seen)
+        self._records_per_target = collections.Counter() # target -> Anzahl der (target, scan_type)-Einträge
+        self.max_weight = {LEVEL_HOST: 0, LEVEL_SUBNET: 0, LEVEL_BLOCK: 0}
+        self.target_count = 0
+
+    def __len__(self):
+        return self.target_count
+
+    def _add_node(self, key, level, label, parent, x, y, size):
+        node = TopologyNode(key, level, label, parent, x, y, size)
+        self.nodes[key] = node
+        self.indexes[level].insert(key, x, y, size)
+        return node
+
+    def _block(self, block_key):
+        node = self.nodes.get(("block", block_key))
+        if node is None:
+            # Frei gewordene Positionen zuerst wiederverwenden, damit das Layout kompakt bleibt
+            if None in self._block_order:
+                position = self._block_order.index(None)
+                self._block_order[position] = block_key
+            else:
+                position = len(self._block_order)
+                self._block_order.append(block_key)
+            x = (position % BLOCKS_PER_ROW) * BLOCK_PITCH
+            y = (position // BLOCKS_PER_ROW) * BLOCK_PITCH
+            node = self._add_node(("block", block_key), LEVEL_BLOCK, block_key, None, x, y, BLOCK_SIZE)
+        return node
+
+    def _allocate(self, counter, group, capacity=GRID * GRID):
+        """
+        Vergibt einen freien Slot einer Gruppe: zuerst den kleinsten frei gewordenen,
+        sonst den nächsten noch nie vergebenen. None, wenn die Gruppe voll ist.
+        """
+        free = self._free_slots.get(group)
+        if free:
+            return heapq.heappop(free)
+        slot = counter[group]
+        if slot >= capacity:
+            return None
+        counter[group] = slot + 1
+        return slot
+
+    def _release(self, key):
+        """Gibt den in Reihenfolge vergebenen Slot eines entfernten Knotens zur Wiederverwendung frei."""
+        allocation = self._slots.pop(key, None)
+        if allocation is not None:
+            group, slot = allocation
+            heapq.heappush(self._free_slots[group], slot)
+
+    @staticmethod
+    def _continuation(group):
+        """Name der Fortsetzungsgruppe: "MAC" -> "MAC (2)" -> "MAC (3)" ..."""
+        match = re.match(r"^(.*) \((\d+)\)$", group)
+        if match:
+            return f"{match.group(1)} ({int(match.group(2)) + 1})"
+        return f"{group} (2)"
+
+    def _subnet(self, block_key, subnet_key, slot=None):
+        key = ("subnet", block_key, subnet_key)
+        node = self.nodes.get(key)
+        if node is not None:
+            return node
+        if slot is None:
+            # Das Subnetz kann bereits in einem Fortsetzungsblock liegen
+            continuation = self._overflow.get(block_key)
+            while continuation is not None:
+                node = self.nodes.get(("subnet", continuation, subnet_key))
+                if node is not None:
+                    return node
+                continuation = self._overflow.get(continuation)
+            # Neu anlegen im ersten Block der Kette mit freiem Slot
+            slot = self._allocate(self._next_subnet_slot, block_key)
+            while slot is None:
+                # Block voll: in einem Fortsetzungsblock weitermachen
+                block_key = self._overflow.setdefault(block_key, self._continuation(block_key))
+                slot = self._allocate(self._next_subnet_slot, block_key)
+            key = ("subnet", block_key, subnet_key)
+            self._slots[key] = (block_key, slot)
+        block = self._block(block_key)
+        x = block.x + (slot % GRID) * SUBNET_SIZE
+        y = block.y + (slot // GRID) * SUBNET_SIZE
+        return self._add_node(key, LEVEL_SUBNET, subnet_key, block.key, x, y, SUBNET_SIZE)
+
+    def _host(self, target, block_key, subnet_key, slot_hint):
+        node = self.nodes.get(target)
+        if node is not None:
+            return node
+        if slot_hint is not None:
+            subnet = self._subnet(block_key, subnet_key, slot_hint[0])
+            slot = slot_hint[1]
+        else:
+            # Erstes Subnetz der Kette (subnet_key, "subnet_key (2)", ...) mit freiem Slot
+            group = subnet_key
+            subnet = self._subnet(block_key, group)
+            slot = self._allocate(self._next_host_slot, subnet.key)
+            while slot is None:
+                # Subnetz voll: Fortsetzung verwenden oder anlegen
+                group = self._continuation(group)
+                subnet = self._subnet(block_key, group)
+                slot = self._allocate(self._next_host_slot, subnet.key)
+            self._slots[target] = (subnet.key, slot)
+        x = subnet.x + (slot % GRID) * HOST_SIZE
+        y = subnet.y + (slot // GRID) * HOST_SIZE
+        return self._add_node(target, LEVEL_HOST, target, subnet.key, x, y, HOST_SIZE)
+
+    def update(self, records):
+        """
+        Übernimmt Zielstatistiken (z.B. aus DBManager.get_scan_targets()):
+        Tupel (target, scan_type, scans, failed, reports, last_seen).
+
+        Returns:
+            Menge der Knotenschlüssel, deren Werte sich geändert haben oder die neu sind.
+        """
+        nodes = self.nodes
+        deltas = {} # Knotenschlüssel -> [scans, failed, reports, neue Ziele, last_seen]
+        for target, scan_type, scans, failed, reports, last_seen in records:
+            if not target:
+                continue
+            values = (scans or 0, failed or 0, reports or 0, last_seen)
+            previous = self._targets.get((target, scan_type))
+            if previous == values:
+                continue
+            self._targets[(target, scan_type)] = values
+            if previous is None:
+                self._records_per_target[target] += 1
+            old_scans, old_failed, old_reports, _ = previous or (0, 0, 0, None)
+
+            is_new_target = target not in nodes
+            if is_new_target:
+                block_key, subnet_key, slot_hint = classify_target(target, scan_type)
+                self._host(target, block_key, subnet_key, slot_hint)
+                self.target_count += 1
+            delta = deltas.get(target)
+            if delta is None:
+                delta = deltas[target] = [0, 0, 0, 0, None]
+            delta[0] += values[0] - old_scans
+            delta[1] += values[1] - old_failed
+            delta[2] += values[2] - old_reports
+            delta[3] += is_new_target
+            if last_seen is not None and (delta[4] is None or last_seen > delta[4]):
+                delta[4] = last_seen
+        return self._propagate(deltas)
+
+    def remove_missing(self, present):
+        """
+        Entfernt nach einem vollständigen Neuladen alle Einträge, die nicht mehr in
+        present (Menge von (target, scan_type)) enthalten sind, z.B. weil ihre Scans
+        durch eine RetentionPolicy gelöscht wurden. Ihre Werte werden von Subnetz und
+        Block abgezogen; Ziele ohne verbleibende Einträge sowie Subnetze und Blöcke ohne
+        Ziele verschwinden aus Modell und Index, ihre Slots werden wieder frei.
+
+        Returns:
+            Menge der geänderten oder entfernten Knotenschlüssel.
+        """
+        deltas = {}
+        removed_targets = []
+        for record_key in [record_key for record_key in self._targets if record_key not in present]:
+            scans, failed, reports, _ = self._targets.pop(record_key)
+            target = record_key[0]
+            delta = deltas.get(target)
+            if delta is None:
+                delta = deltas[target] = [0, 0, 0, 0, None]
+            delta[0] -= scans
+            delta[1] -= failed
+            delta[2] -= reports
+            self._records_per_target[target] -= 1
+            if not self._records_per_target[target]:
+                del self._records_per_target[target]
+                delta[3] -= 1
+                removed_targets.append(target)
+        if not deltas:
+            return set()
+        changed = self._propagate(deltas)
+        for target in removed_targets:
+            self._remove_node(target)
+            self.target_count -= 1
+        for level in (LEVEL_SUBNET, LEVEL_BLOCK):
+            for key in [key for key in changed if key in self.nodes and self.nodes[key].level == level
+                        and self.nodes[key].children <= 0]:
+                self._remove_node(key)
+        # Maxima können gesunken sein; Farbskala neu bestimmen
+        for level in self.max_weight:
+            self.max_weight[level] = max((node.scans + node.reports for node in self.nodes.values()
+                                          if node.level == level), default=0)
+        return changed
+
+    def _remove_node(self, key):
+        """Entfernt einen Knoten aus Modell, Rasterindex und Slot-Verwaltung."""
+        node = self.nodes.pop(key)
+        self.indexes[node.level].remove(key, node.x, node.y, node.size)
+        self._release(key)
+        # Slots werden je Subnetz (Knotenschlüssel) bzw. je Block (Blockname) vergeben;
+        # ein später neu angelegter Knoten gleichen Namens beginnt wieder leer
+        group = node.label if node.level == LEVEL_BLOCK else key
+        self._next_host_slot.pop(group, None)
+        self._next_subnet_slot.pop(group, None)
+        self._free_slots.pop(group, None)
+        if node.level == LEVEL_BLOCK:
+            position = self._block_order.index(node.label)
+            self._block_order[position] = None
+            while self._block_order and self._block_order[-1] is None:
+                self._block_order.pop()
+
+    def _propagate(self, deltas):
+        """
+        Wendet Differenzen [scans, failed, reports, neue Ziele, last_seen] je Ziel an.
+
+        Returns:
+            Menge der geänderten Knotenschlüssel aller Ebenen.
+        """
+        nodes = self.nodes
+        # Differenzen ebenenweise nach oben propagieren (Ziel -> Subnetz -> Block),
+        # so dass jeder Elternknoten nur einmal pro Aufruf angefasst wird
+        changed = set()
+        for level in (LEVEL_HOST, LEVEL_SUBNET, LEVEL_BLOCK):
+            parent_deltas = {}
+            max_weight = self.max_weight[level]
+            for key, (scans, failed, reports, new_targets, last_seen) in deltas.items():
+                node = nodes[key]
+                node.scans += scans
+                node.failed += failed
+                node.reports += reports
+                if level != LEVEL_HOST:
+                    node.children += new_targets
+                if last_seen is not None and (node.last_seen is None or last_seen > node.last_seen):
+                    node.last_seen = last_seen
+                max_weight = max(max_weight, node.scans + node.reports)
+                if node.parent is not None:
+                    parent = parent_deltas.get(node.parent)
+                    if parent is None:
+                        parent_deltas[node.parent] = [scans, failed, reports, new_targets, last_seen]
+                    else:
+                        parent[0] += scans
+                        parent[1] += failed
+                        parent[2] += reports
+                        parent[3] += new_targets
+                        if last_seen is not None and (parent[4] is None or last_seen > parent[4]):
+                            parent[4] = last_seen
+            self.max_weight[level] = max_weight
+            changed.update(deltas)
+            deltas = parent_deltas
+        return changed
+
+    @staticmethod
+    def level_for_scale(scale):
+        """Wählt die Detailstufe für einen Zoomfaktor (Pixel pro Welteinheit)."""
+        if HOST_SIZE * scale >= MIN_HOST_PIXELS:
+            return LEVEL_HOST
+        if SUBNET_SIZE * scale >= MIN_SUBNET_PIXELS:
+            return LEVEL_SUBNET
+        return LEVEL_BLOCK
+
+    def visible(self, level, x0, y0, x1, y1):
+        """Schlüssel aller Knoten der Ebene, die das Weltrechteck schneiden."""
+        visible = set()
+        nodes = self.nodes
+        for key in self.indexes[level].query_rect(x0, y0, x1, y1):
+            node = nodes[key]
+            if node.x < x1 and node.x + node.size > x0 and node.y < y1 and node.y + node.size > y0:
+                visible.add(key)
+        return visible
+
+    def hit_test(self, level, x, y):
+        """Gibt den Knoten der Ebene an der Weltposition zurück (oder None)."""
+        for key in self.indexes[level].query_point(x, y):
+            node = self.nodes[key]
+            if node.x <= x < node.x + node.size and node.y <= y < node.y + node.size:
+                return node
+        return None
+
+    def heat_reference(self, level):
+        """
+        Bezugsgröße der Farbskala je Ebene, auf die nächste Zehnerpotenz gerundet.
+        Ändert sich nur sprunghaft, damit neue Daten nicht jedes Mal alle Farben verschieben.
+        """
+        maximum = self.max_weight[level]
+        return 10 ** math.ceil(math.log10(maximum)) if maximum > 1 else 1
+
+    def bounds(self):
+        """Weltkoordinaten (x0, y0, x1, y1), die alle Blöcke umfassen."""
+        if not self._block_order:
+            return 0.0, 0.0, BLOCK_SIZE, BLOCK_SIZE
+        rows = (len(self._block_order) - 1) // BLOCKS_PER_ROW + 1
+        columns = min(len(self._block_order), BLOCKS_PER_ROW)
+        return 0.0, 0.0, columns * BLOCK_PITCH, rows * BLOCK_PITCH
@@ -0,0 +1,104 @@
+# query_cache.py
+
+# Ergebnis-Cache für DBManager-Abfragen.
+# Einträge sind über (normalisierte Query, Parameter) adressiert, werden per LRU
+# verdrängt und tabellenweise invalidiert, sobald in eine der gelesenen Tabellen geschrieben wird.
+
+import collections
+import threading
+
+
+def normalize_sql(statement):
+    """Vereinheitlicht Leerraum, damit gleiche Queries denselben Schlüssel erhalten."""
+    return " ".join(str(statement).split())
+
+
+class QueryCache:
+    """
+    Größenbegrenzter LRU-Cache für Abfrageergebnisse mit Invalidierung pro Tabelle.
+    max_entries=0 deaktiviert den Cache (jede Abfrage zählt dann als Miss).
+    Ergebnisse mit mehr als max_result_rows Zeilen werden nicht gespeichert,
+    damit vollständige Tabellen-Ladevorgänge den Speicher nicht dauerhaft belegen.
+    """
+    def __init__(self, max_entries=256, max_result_rows=50_000):
+        self.max_entries = max_entries
+        self.max_result_rows = max_result_rows
+        self._entries = collections.OrderedDict()   # key -> (Ergebnis, Tabellen)
+        self._keys_by_table = collections.defaultdict(set)
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.clears = 0
+
+    @staticmethod
+    def make_key(statement, params):
+        """Bildet den Cache-Schlüssel aus SQL-Text und Parametern."""
+        return normalize_sql(statement), tuple(sorted((str(k), repr(v)) for k, v in dict(params).items()))
+
+    def get(self, key):
+        """Gibt (True, Ergebnis) bei einem Treffer zurück, sonst (False, None)."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key][0]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, result, tables):
+        """Speichert ein Ergebnis (Liste von Zeilen), das aus den angegebenen Tabellen gelesen wurde."""
+        if self.max_entries <= 0 or len(result) > self.max_result_rows:
+            return
+        tables = frozenset(tables)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (result, tables)
+            for table in tables:
+                self._keys_by_table[table].add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, tables = self._entries.pop(key)
+        for table in tables:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_table[table]
+
+    def invalidate(self, *tables):
+        """Verwirft alle Einträge, die eine der Tabellen gelesen haben."""
+        with self._lock:
+            for table in tables:
+                for key in list(self._keys_by_table.get(table, ())):
+                    self._remove(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        """Leert den Cache; die verworfenen Einträge zählen als Invalidierungen."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self.clears += 1
+            self._entries.clear()
+            self._keys_by_table.clear()
+
+    def stats(self):
+        """Gibt Treffer-/Fehlzugriffsstatistiken als Dict zurück."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "clears": self.clears,
+            }
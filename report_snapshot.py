@@ -0,0 +1,300 @@
+# report_snapshot.py
+
+# Kompaktes, spaltenorientiertes Snapshot-Format für die CodeAnalysisReports eines Scans.
+# Die Datei wird schreibgeschützt per mmap geöffnet; Zeilen sind ohne Parsen
+# der gesamten Datei direkt adressierbar.
+#
+# Aufbau (Little Endian, alle Abschnitte 8-Byte-ausgerichtet):
+#   Header      magic, Version, Zeilenanzahl, Offsets/Längen der Abschnitte
+#   Text-Heap   UTF-8-Bytes von file_path, description, code_snippet hintereinander
+#   Spalten     id (int64), scan_id (int64), line_number (int32, -1 = None),
+#               analysis_date (float64 Sekunden seit 1970-01-01 ohne Zeitzone, NaN = None),
+#               severity/status (uint8) und issue_type (uint16) als Wörterbuch-Codes,
+#               3n+1 Heap-Offsets (uint64); Textfeld f der Zeile i liegt zwischen
+#               offsets[3i+f] und offsets[3i+f+1]
+#   Metadaten   JSON: Wörterbücher der kodierten Spalten und Scan-Informationen
+
+import array
+import datetime
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+
+MAGIC = b"TSRSNAP\0"
+FORMAT_VERSION = 1
+EPOCH = datetime.datetime(1970, 1, 1)
+FILE_EXTENSION = ".tsnap"
+
+# magic, version, reserved, row_count, heap_offset, heap_length, columns_offset, meta_offset, meta_length
+_HEADER = struct.Struct("<8sHHIQQQQQ")
+_ALIGNMENT = 8
+
+TEXT_FIELDS = ("file_path", "description", "code_snippet")
+# Spaltenname -> array-Typcode (feste Breite)
+FIXED_COLUMNS = (
+    ("id", "q"),
+    ("scan_id", "q"),
+    ("line_number", "i"),
+    ("analysis_date", "d"),
+    ("severity", "B"),
+    ("status", "B"),
+    ("issue_type", "H"),
+)
+ENCODED_COLUMNS = ("severity", "status", "issue_type")
+FIELDS = ("id", "scan_id", "file_path", "issue_type", "severity", "description",
+          "line_number", "code_snippet", "analysis_date", "status")
+
+
+class SnapshotFormatError(ValueError):
+    """Die Datei ist kein gültiger Report-Snapshot oder hat eine unbekannte Version."""
+
+
+def _check_byteorder():
+    # Die Spalten werden als native array-/memoryview-Daten gelesen
+    if sys.byteorder != "little":
+        raise SnapshotFormatError("Report-Snapshots werden nur auf Little-Endian-Systemen unterstützt.")
+
+
+def _pad(f):
+    """Füllt die Datei mit Nullbytes bis zur nächsten Ausrichtungsgrenze auf."""
+    remainder = f.tell() % _ALIGNMENT
+    if remainder:
+        f.write(b"\0" * (_ALIGNMENT - remainder))
+
+
+def _get(row, name):
+    """Liest ein Feld aus einem ORM-Objekt, einer Core-Zeile oder einem Dict."""
+    if isinstance(row, dict):
+        return row.get(name)
+    return getattr(row, name)
+
+
+def write_snapshot(path, rows, metadata=None):
+    """
+    Schreibt Berichte (ORM-Objekte, Core-Zeilen oder Dicts) als Snapshot-Datei.
+    Die Zeilen sollten nach id aufsteigend sortiert sein, damit ReportSnapshot.find funktioniert.
+    Der Text-Heap wird gestreamt geschrieben; im Speicher liegen nur die festen Spalten.
+    Die Datei wird atomar ersetzt.
+
+    Returns:
+        Anzahl der geschriebenen Zeilen.
+    """
+    _check_byteorder()
+    columns = {name: array.array(code) for name, code in FIXED_COLUMNS}
+    offsets = array.array("Q", [0])
+    dictionaries = {name: [] for name in ENCODED_COLUMNS}
+    codes = {name: {} for name in ENCODED_COLUMNS}
+    tmp_path = f"{path}.tmp"
+
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(b"\0" * _HEADER.size)
+            _pad(f)
+            heap_offset = f.tell()
+            heap_length = 0
+            row_count = 0
+            for row in rows:
+                for field in TEXT_FIELDS:
+                    data = (_get(row, field) or "").encode("utf-8")
+                    f.write(data)
+                    heap_length += len(data)
+                    offsets.append(heap_length)
+                for name in ENCODED_COLUMNS:
+                    value = _get(row, name)
+                    code = codes[name].get(value)
+                    if code is None:
+                        code = len(dictionaries[name])
+                        # Vor dem Anhängen prüfen; array.append würde sonst mit OverflowError abbrechen
+                        if code >= 2 ** (8 * columns[name].itemsize):
+                            raise SnapshotFormatError(f"Zu viele verschiedene Werte für '{name}'.")
+                        codes[name][value] = code
+                        dictionaries[name].append(value)
+                    columns[name].append(code)
+                line_number = _get(row, "line_number")
+                analysis_date = _get(row, "analysis_date")
+                columns["id"].append(_get(row, "id"))
+                columns["scan_id"].append(_get(row, "scan_id") or 0)
+                columns["line_number"].append(-1 if line_number is None else line_number)
+                columns["analysis_date"].append((analysis_date - EPOCH).total_seconds() if analysis_date else math.nan)
+                row_count += 1
+
+            _pad(f)
+            columns_offset = f.tell()
+            for name, _ in FIXED_COLUMNS:
+                columns[name].tofile(f)
+                _pad(f)
+            offsets.tofile(f)
+
+            meta = {
+                "dictionaries": dictionaries,
+                "metadata": metadata or {},
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            }
+            meta_bytes = json.dumps(meta, default=str).encode("utf-8")
+            meta_offset = f.tell()
+            f.write(meta_bytes)
+
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, row_count, heap_offset, heap_length,
+                                 columns_offset, meta_offset, len(meta_bytes)))
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Keine halb geschriebene .tmp-Datei zurücklassen
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return row_count
+
+
+class ReportSnapshot:
+    """
+    Schreibgeschützter Zugriff auf eine Snapshot-Datei per mmap.
+    Öffnen liest nur Header und Metadaten; Spalten sind memoryviews direkt auf die Datei,
+    Texte werden erst beim Zugriff dekodiert.
+    """
+    def __init__(self, path):
+        _check_byteorder()
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise SnapshotFormatError(f"'{path}' ist leer.")
+        try:
+            self._load()
+        except Exception:
+            self.close()
+            raise
+
+    def _load(self):
+        if len(self._mmap) < _HEADER.size:
+            raise SnapshotFormatError(f"'{self.path}' ist zu kurz für einen Report-Snapshot.")
+        (magic, version, _, self.row_count, heap_offset, heap_length,
+         columns_offset, meta_offset, meta_length) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise SnapshotFormatError(f"'{self.path}' ist kein Report-Snapshot.")
+        if version != FORMAT_VERSION:
+            raise SnapshotFormatError(f"Nicht unterstützte Snapshot-Version {version}.")
+
+        view = memoryview(self._mmap)
+        self._views = [view]
+        self._heap = view[heap_offset:heap_offset + heap_length]
+        self._views.append(self._heap)
+        self.columns = {}
+        position = columns_offset
+        n = self.row_count
+        for name, code in FIXED_COLUMNS:
+            size = n * struct.calcsize(code)
+            self.columns[name] = view[position:position + size].cast(code)
+            position += size + (-size) % _ALIGNMENT
+        size = (len(TEXT_FIELDS) * n + 1) * 8
+        self._offsets = view[position:position + size].cast("Q")
+        self._views.extend(self.columns.values())
+        self._views.append(self._offsets)
+
+        meta = json.loads(bytes(view[meta_offset:meta_offset + meta_length]).decode("utf-8"))
+        self.dictionaries = meta["dictionaries"]
+        self.metadata = meta["metadata"]
+        self.created = meta["created"]
+
+    def __len__(self):
+        return self.row_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Gibt die memoryviews, das mmap und die Datei frei."""
+        for view in reversed(getattr(self, "_views", [])):
+            view.release()
+        self._views = []
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def text(self, field, index, max_chars=None):
+        """
+        Dekodiert ein Textfeld einer Zeile. Mit max_chars wird nur der Anfang
+        gelesen (für Vorschauen in Listen).
+        """
+        slot = index * len(TEXT_FIELDS) + TEXT_FIELDS.index(field)
+        start, end = self._offsets[slot], self._offsets[slot + 1]
+        if max_chars is not None:
+            # UTF-8 benötigt höchstens 4 Bytes pro Zeichen
+            end = min(end, start + max_chars * 4)
+        return bytes(self._heap[start:end]).decode("utf-8", errors="ignore")
+
+    def preview(self, field, index, length):
+        """Einzeilige, gekürzte Vorschau eines Textfelds (wie die SQL-Vorschau des DBManagers)."""
+        text = self.text(field, index, max_chars=length + 1)
+        flattened = text[:length].replace("\n", " ")
+        return flattened + "..." if len(text) > length else flattened
+
+    def texts(self, field, max_chars=None, start=0, stop=None):
+        """
+        Dekodiert ein Textfeld für die Zeilen start..stop (Standard: alle) auf einmal
+        und gibt sie als Liste in Zeilenreihenfolge zurück.
+        """
+        step = len(TEXT_FIELDS)
+        first = TEXT_FIELDS.index(field) + start * step
+        last = TEXT_FIELDS.index(field) + (self.row_count if stop is None else stop) * step
+        starts = self._offsets[first:last:step].tolist()
+        ends = self._offsets[first + 1:last + 1:step].tolist()
+        heap = self._heap
+        if max_chars is None:
+            return [str(heap[begin:end], "utf-8", "ignore") for begin, end in zip(starts, ends)]
+        max_bytes = max_chars * 4
+        return [str(heap[begin:end if end - begin < max_bytes else begin + max_bytes], "utf-8", "ignore")
+                for begin, end in zip(starts, ends)]
+
+    def previews(self, field, length, start=0, stop=None):
+        """Vorschauen (wie preview) eines Textfelds für die Zeilen start..stop auf einmal."""
+        return [text[:length].replace("\n", " ") + "..." if len(text) > length else text.replace("\n", " ")
+                for text in self.texts(field, length + 1, start, stop)]
+
+    def value(self, name, index):
+        """Gibt den dekodierten Wert einer Spalte für eine Zeile zurück."""
+        if name in TEXT_FIELDS:
+            return self.text(name, index)
+        raw = self.columns[name][index]
+        if name in ENCODED_COLUMNS:
+            return self.dictionaries[name][raw]
+        if name == "line_number":
+            return None if raw < 0 else raw
+        if name == "analysis_date":
+            return None if math.isnan(raw) else EPOCH + datetime.timedelta(seconds=raw)
+        if name == "scan_id":
+            return raw or None
+        return raw
+
+    def row(self, index):
+        """Gibt eine vollständige Zeile als Dict zurück (wahlfreier Zugriff)."""
+        if not -self.row_count <= index < self.row_count:
+            raise IndexError(index)
+        index %= self.row_count
+        return {name: self.value(name, index) for name in FIELDS}
+
+    def __getitem__(self, index):
+        return self.row(index)
+
+    def find(self, report_id):
+        """Sucht die Zeilennummer zu einer Bericht-ID (IDs sind aufsteigend sortiert)."""
+        ids = self.columns["id"]
+        low, high = 0, self.row_count
+        while low < high:
+            middle = (low + high) // 2
+            if ids[middle] < report_id:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < self.row_count and ids[low] == report_id else None
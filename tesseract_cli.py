@@ -0,0 +1,286 @@
+# tesseract_cli.py
+
+# Kommandozeilen-Zugriff auf die Tesseract-Datenbank ohne GUI (kein tkinter-Import).
+# Nutzdaten gehen nach stdout, Statusmeldungen des DBManagers nach stderr.
+#
+# Beispiele:
+#   python tesseract_cli.py import reports findings.jsonl
+#   cat scans.jsonl | python tesseract_cli.py import scans -
+#   python tesseract_cli.py query reports --severity Critical --status New
+#   python tesseract_cli.py query reports --severity Low --format ids | python tesseract_cli.py status Ignored -
+#   python tesseract_cli.py stats
+#   python tesseract_cli.py export reports --format csv --output reports.csv
+#   python tesseract_cli.py snapshot 42 scan_42.tsnap
+
+import argparse
+import collections
+import contextlib
+import csv
+import datetime
+import json
+import os
+import sys
+
+DEFAULT_DB_PATH = 'teasesraect.db'
+
+# CLI-Tabellennamen -> Modellnamen in db_mgr
+TABLE_MODELS = {
+    "scans": "Scan",
+    "reports": "CodeAnalysisReport",
+    "wordlist": "WordlistEntry",
+    "exploits": "ExploitEntry",
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _format_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+def write_rows(rows, columns, fmt, out):
+    """Schreibt Zeilen (Mappings) als jsonl, csv oder tsv; gibt die Anzahl zurück."""
+    count = 0
+    if fmt == "jsonl":
+        for row in rows:
+            out.write(json.dumps({c: row[c] for c in columns}, default=_json_default) + "\n")
+            count += 1
+        return count
+    writer = csv.writer(out, delimiter="\t" if fmt == "tsv" else ",", lineterminator="\n")
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_format_value(row[c]) for c in columns])
+        count += 1
+    return count
+
+
+def read_jsonl(stream):
+    """Liest JSON Lines zeilenweise (leere Zeilen werden übersprungen)."""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Zeile {line_number}: ungültiges JSON ({e})")
+
+
+def _coerce_record(table, record, line_number):
+    """
+    Übernimmt nur bekannte Spalten, wandelt ISO-Zeitstempel für DateTime-Spalten um
+    und prüft Pflichtfelder (NOT NULL ohne Standardwert).
+    """
+    from sqlalchemy import DateTime
+
+    if not isinstance(record, dict):
+        raise ValueError(f"Zeile {line_number}: JSON-Objekt erwartet")
+    unknown = set(record) - set(table.c.keys())
+    if unknown:
+        print(f"WARNUNG: Zeile {line_number}: unbekannte Felder ignoriert: {', '.join(sorted(unknown))}",
+              file=sys.stderr)
+    row = {}
+    for column in table.columns:
+        if column.name not in record:
+            continue
+        value = record[column.name]
+        if isinstance(column.type, DateTime) and isinstance(value, str):
+            try:
+                value = datetime.datetime.fromisoformat(value)
+            except ValueError as e:
+                raise ValueError(f"Zeile {line_number}: ungültiger Zeitstempel in '{column.name}' ({e})")
+        row[column.name] = value
+    for column in table.columns:
+        if (not column.nullable and not column.primary_key and column.default is None
+                and column.server_default is None and row.get(column.name) is None):
+            raise ValueError(f"Zeile {line_number}: Pflichtfeld '{column.name}' fehlt")
+    return row
+
+
+@contextlib.contextmanager
+def _open_input(path):
+    if path == "-":
+        yield sys.stdin
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield f
+
+
+@contextlib.contextmanager
+def _open_output(path, out):
+    if path in (None, "-"):
+        yield out
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            yield f
+
+
+def cmd_import(db, args, out):
+    model = getattr(db, TABLE_MODELS[args.table])
+    table = model.__table__
+    read = 0
+    # Zeilennummern des letzten Batches (plus der bereits gelesenen Zeile, die ihn
+    # bei wechselnden Feldern vorzeitig auslöst), um einen fehlgeschlagenen Batch benennen zu können
+    recent_lines = collections.deque(maxlen=args.batch_size + 1)
+
+    def records(stream):
+        nonlocal read
+        for line_number, record in read_jsonl(stream):
+            row = _coerce_record(table, record, line_number)
+            recent_lines.append(line_number)
+            read += 1
+            yield row
+
+    with _open_input(args.file) as stream:
+        inserted = args.manager.bulk_insert(model, records(stream), batch_size=args.batch_size)
+    print(json.dumps({"table": args.table, "read": read, "inserted": inserted}), file=out)
+    if inserted < read:
+        failed_lines = list(recent_lines)[-(read - inserted):]
+        print(f"FEHLER: Datensätze aus Zeile {failed_lines[0]} bis {failed_lines[-1]} wurden nicht eingefügt "
+              f"(Batch abgelehnt, siehe Meldung des DBManagers).", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_query(db, args, out):
+    manager = args.manager
+    if args.table == "reports":
+        rows = [row._mapping for row in manager.get_code_analysis_report_summaries(
+            limit=args.limit, offset=args.offset, severity=args.severity, status=args.status,
+            issue_type=args.issue_type, scan_id=args.scan_id)]
+        columns = ["id", "file_path", "issue_type", "severity", "description_preview",
+                   "line_number", "snippet_preview", "analysis_date", "status"]
+    else:
+        rows = (row._mapping for row in manager.iter_rows(db.Scan, limit=args.limit, offset=args.offset,
+                                                          scan_type=args.scan_type, status=args.status))
+        columns = ["id", "scan_type", "target", "start_time", "end_time", "status"]
+    if args.format == "ids":
+        for row in rows:
+            out.write(f"{row['id']}\n")
+        return 0
+    write_rows(rows, columns, args.format, out)
+    return 0
+
+
+def cmd_status(db, args, out):
+    ids = list(args.report_ids)
+    if ids == ["-"]:
+        ids = [line.strip() for line in sys.stdin if line.strip()]
+    try:
+        report_ids = [int(report_id) for report_id in ids]
+    except ValueError as e:
+        print(f"FEHLER: ungültige Bericht-ID ({e})", file=sys.stderr)
+        return 2
+    updated = args.manager.update_report_statuses(report_ids, args.new_status) if report_ids else 0
+    print(json.dumps({"status": args.new_status, "requested": len(report_ids), "updated": updated}), file=out)
+    return 0 if updated == len(report_ids) else 1
+
+
+def cmd_stats(db, args, out):
+    manager = args.manager
+    stats = {
+        "db_path": os.path.abspath(manager.db_path),
+        "rows": {name: manager.count_rows(getattr(db, model)) for name, model in TABLE_MODELS.items()},
+        "reports_by_severity": manager.count_reports_by_severity(),
+        "reports_by_status": manager.count_reports_by_status(),
+        "archives": manager.list_archives(),
+    }
+    out.write(json.dumps(stats, indent=2, default=_json_default) + "\n")
+    return 0
+
+
+def cmd_export(db, args, out):
+    model = getattr(db, TABLE_MODELS[args.table])
+    columns = list(model.__table__.c.keys())
+    with _open_output(args.output, out) as target:
+        rows = (row._mapping for row in args.manager.iter_rows(model))
+        count = write_rows(rows, columns, args.format, target)
+    print(f"INFO: {count} Zeilen aus '{args.table}' exportiert.", file=sys.stderr)
+    return 0
+
+
+def cmd_snapshot(db, args, out):
+    count = args.manager.write_report_snapshot(args.scan_id, args.output)
+    print(json.dumps({"scan_id": args.scan_id, "path": args.output, "reports": count}), file=out)
+    return 0 if count >= 0 else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="tesseract_cli", description="Headless-Zugriff auf die Tesseract-Datenbank")
+    parser.add_argument("--db", default=os.environ.get("TESSERACT_DB", DEFAULT_DB_PATH),
+                        help="Pfad zur SQLite-Datenbank (Standard: $TESSERACT_DB oder %(default)s)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Statusmeldungen des DBManagers unterdrücken")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p_import = subparsers.add_parser("import", help="Einträge aus JSON Lines importieren (gestreamt)")
+    p_import.add_argument("table", choices=sorted(TABLE_MODELS))
+    p_import.add_argument("file", help="JSONL-Datei oder '-' für stdin")
+    p_import.add_argument("--batch-size", type=int, default=1000)
+    p_import.set_defaults(func=cmd_import)
+
+    p_query = subparsers.add_parser("query", help="Berichte oder Scans gefiltert ausgeben")
+    p_query.add_argument("table", choices=["reports", "scans"])
+    p_query.add_argument("--severity")
+    p_query.add_argument("--status")
+    p_query.add_argument("--issue-type")
+    p_query.add_argument("--scan-id", type=int)
+    p_query.add_argument("--scan-type", help="Nur für scans")
+    p_query.add_argument("--limit", type=int)
+    p_query.add_argument("--offset", type=int, default=0)
+    p_query.add_argument("--format", choices=["jsonl", "csv", "tsv", "ids"], default="jsonl")
+    p_query.set_defaults(func=cmd_query)
+
+    p_status = subparsers.add_parser("status", help="Status von Berichten setzen")
+    p_status.add_argument("new_status", help="z.B. New, Triaged, FalsePositive, Fixed, Ignored")
+    p_status.add_argument("report_ids", nargs="+", help="Bericht-IDs oder '-' für IDs von stdin (eine pro Zeile)")
+    p_status.set_defaults(func=cmd_status)
+
+    p_stats = subparsers.add_parser("stats", help="Übersicht als JSON")
+    p_stats.set_defaults(func=cmd_stats)
+
+    p_export = subparsers.add_parser("export", help="Vollständige Tabelle exportieren (gestreamt)")
+    p_export.add_argument("table", choices=sorted(TABLE_MODELS))
+    p_export.add_argument("--format", choices=["jsonl", "csv", "tsv"], default="jsonl")
+    p_export.add_argument("--output", help="Zieldatei (Standard: stdout)")
+    p_export.set_defaults(func=cmd_export)
+
+    p_snapshot = subparsers.add_parser("snapshot", help="Berichte eines Scans als Report-Snapshot schreiben")
+    p_snapshot.add_argument("scan_id", type=int)
+    p_snapshot.add_argument("output", help="Zieldatei (z.B. scan_42.tsnap)")
+    p_snapshot.set_defaults(func=cmd_snapshot)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    out = sys.stdout
+    # DBManager meldet Status per print(); diese Meldungen dürfen die Nutzdaten auf stdout nicht stören
+    log_target = open(os.devnull, "w") if args.quiet else sys.stderr
+    try:
+        with contextlib.redirect_stdout(log_target):
+            # Erst nach dem Parsen importieren, damit --help ohne SQLAlchemy-Import startet
+            import db_mgr as db
+            args.manager = db.DBManager(args.db, cache_size=0)
+            return args.func(db, args, out)
+    except BrokenPipeError:
+        # Leser (z.B. head) hat die Pipe geschlossen; weitere Ausgaben ins Leere leiten
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"FEHLER: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.quiet:
+            log_target.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())